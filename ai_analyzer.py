@@ -1,22 +1,81 @@
 """AI analysis functionality supporting OpenAI and Gemini APIs."""
 
 import asyncio
-import base64
+import importlib.util
+import io
 import json
 import logging
+import random
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
 from dataclasses import dataclass, field
 from typing import Optional
 
-import aiofiles
+try:
+    import pybase64 as _b64  # SIMD-accelerated drop-in for base64
+except ImportError:
+    import base64 as _b64
 
-from config import ProcessingConfig, AIProvider
+from config import (
+    ProcessingConfig,
+    AIProvider,
+    DATACLASS_SLOTS,
+    DEFAULT_JPEG_QUALITY,
+    MAX_AI_IMAGE_EDGE,
+    AI_MAX_ATTEMPTS,
+    AI_RETRY_BASE_DELAY,
+    AI_RETRY_MAX_DELAY,
+    RETRYABLE_STATUS_CODES,
+)
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets concurrent OpenAI requests share one connection (needs the optional h2 package)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
-@dataclass
+# Slide images are produced as JPEG by ImageExtractor
+IMAGE_MIME_TYPE = "image/jpeg"
+
+# Reused decoder for extracting the first JSON object from AI responses
+_JSON_DECODER = json.JSONDecoder()
+
+# Defaults for unparseable AI responses; per-slide fields are filled in on copy
+_FALLBACK_TEMPLATE = {
+    "title": None,
+    "description": None,
+    "priority": "Medium",
+    "issue_type": "Task",
+    "labels": None
+}
+
+
+def _load_image_bytes(image_path: str, max_bytes: int) -> bytes:
+    """Read an image, downscaling and re-encoding it as JPEG if it exceeds max_bytes."""
+    data = Path(image_path).read_bytes()
+    if len(data) <= max_bytes:
+        return data
+    
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGB")
+        img.thumbnail((MAX_AI_IMAGE_EDGE, MAX_AI_IMAGE_EDGE), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, "JPEG", quality=DEFAULT_JPEG_QUALITY)
+    logger.debug("Recompressed %s from %s to %s bytes", image_path, len(data), buffer.tell())
+    return buffer.getvalue()
+
+
+def _build_data_url(data: bytes, mime_type: str) -> str:
+    """Build a base64 data URL for image bytes in a single pass.
+
+    Runs on the default thread executor. Encoding a slide image takes a few
+    milliseconds in C, less than pickling the bytes to a worker process would.
+    """
+    return f"data:{mime_type};base64,{_b64.b64encode(data).decode('ascii')}"
+
+
+@dataclass(**DATACLASS_SLOTS)
 class SlideAnalysis:
     """Data class for slide analysis results."""
     slide_number: int
@@ -48,10 +107,14 @@ class BaseAIClient(ABC):
         self.config = config
     
     @abstractmethod
-    async def analyze_image(self, base64_image: str, slide_num: int) -> AIAnalysisResponse:
-        """Analyze an image and return the raw response content."""
+    async def analyze_image(self, image_bytes: bytes, slide_num: int) -> AIAnalysisResponse:
+        """Analyze raw image bytes and return the raw response content."""
         pass
     
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Return True when a failed API call is worth retrying."""
+        return False
+    
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -71,7 +134,17 @@ class OpenAIClient(BaseAIClient):
     def __init__(self, config: ProcessingConfig):
         super().__init__(config)
         import openai
-        self.client = openai.AsyncOpenAI(api_key=config.openai_api_key)
+        
+        # The default httpx pool already keeps connections alive for reuse; only opt
+        # in to HTTP/2 when h2 is installed so concurrent requests share one connection
+        http_client = openai.DefaultAsyncHttpxClient(http2=_HTTP2_AVAILABLE)
+        # max_retries=0: _analyze_with_retry is the only retry layer, so a slide
+        # never sends more than AI_MAX_ATTEMPTS requests
+        self.client = openai.AsyncOpenAI(
+            api_key=config.openai_api_key,
+            http_client=http_client,
+            max_retries=0
+        )
     
     @property
     def provider_name(self) -> str:
@@ -81,16 +154,25 @@ class OpenAIClient(BaseAIClient):
     def model_name(self) -> str:
         return self.config.openai_model
     
-    async def analyze_image(self, base64_image: str, slide_num: int) -> AIAnalysisResponse:
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Retry rate limits, connection failures and transient server errors."""
+        import openai
+        if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+            return True
+        return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS_CODES
+    
+    async def analyze_image(self, image_bytes: bytes, slide_num: int) -> AIAnalysisResponse:
         """Analyze an image using OpenAI's Chat API."""
-        system_prompt = get_system_prompt()
-        user_prompt = f"Analyze this slide (slide #{slide_num}) and extract issue information according to the format specified."
+        # Build the data URL off the event loop so other in-flight slides keep progressing
+        loop = asyncio.get_running_loop()
+        image_url = await loop.run_in_executor(None, _build_data_url, image_bytes, IMAGE_MIME_TYPE)
+        user_prompt = get_user_prompt(slide_num)
         
-        logger.info(f"Calling OpenAI API with model: {self.model_name}")
+        logger.info("Calling OpenAI API with model: %s", self.model_name)
         response = await self.client.chat.completions.create(
             model=self.model_name,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": [
@@ -98,7 +180,7 @@ class OpenAIClient(BaseAIClient):
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/png;base64,{base64_image}",
+                                "url": image_url,
                                 "detail": "high"
                             }
                         }
@@ -141,35 +223,32 @@ class GeminiClient(BaseAIClient):
     def model_name(self) -> str:
         return self.config.gemini_model
     
-    async def analyze_image(self, base64_image: str, slide_num: int) -> AIAnalysisResponse:
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Retry resource-exhausted (429) and transient server errors."""
+        from google.genai import errors
+        return isinstance(error, errors.APIError) and error.code in RETRYABLE_STATUS_CODES
+    
+    async def analyze_image(self, image_bytes: bytes, slide_num: int) -> AIAnalysisResponse:
         """Analyze an image using Google Gemini API."""
         from google.genai import types
         
-        system_prompt = get_system_prompt()
-        user_prompt = f"Analyze this slide (slide #{slide_num}) and extract issue information according to the format specified."
-        
-        logger.info(f"Calling Gemini API with model: {self.model_name}")
+        user_prompt = get_user_prompt(slide_num)
         
-        # Decode base64 to bytes for Gemini
-        image_bytes = base64.b64decode(base64_image)
+        logger.info("Calling Gemini API with model: %s", self.model_name)
         
         # Create inline data for the image
         image_part = types.Part.from_bytes(
             data=image_bytes,
-            mime_type="image/png"
+            mime_type=IMAGE_MIME_TYPE
         )
         
         # Combine system prompt and user prompt for Gemini
-        full_prompt = f"{system_prompt}\n\n{user_prompt}"
+        full_prompt = _GEMINI_PROMPT_PREFIX + user_prompt
         
-        # Run the synchronous API call in a thread pool to make it async
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: self.client.models.generate_content(
-                model=self.model_name,
-                contents=[full_prompt, image_part]
-            )
+        # Use the SDK's native async client so no executor thread is tied up per call
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=[full_prompt, image_part]
         )
         
         usage = getattr(response, "usage_metadata", None)
@@ -192,9 +271,8 @@ class GeminiClient(BaseAIClient):
         )
 
 
-def get_system_prompt() -> str:
-    """Get the system prompt for AI analysis."""
-    return """You are an expert at analyzing presentation slides and extracting issue information for Jira management.
+# System prompt shared by every slide analysis; built once at import.
+SYSTEM_PROMPT = """You are an expert at analyzing presentation slides and extracting issue information for Jira management.
 
 Given a slide image, extract the following information for creating a Jira issue:
 
@@ -242,12 +320,45 @@ Given a slide image, extract the following information for creating a Jira issue
 **重要提醒**：標題與描述必須使用繁體中文，其他欄位使用英文。
 """
 
+# Gemini takes a single text part, so the system prompt is pre-joined here.
+_GEMINI_PROMPT_PREFIX = SYSTEM_PROMPT + "\n\n"
+
+
+def get_system_prompt() -> str:
+    """Get the system prompt for AI analysis."""
+    return SYSTEM_PROMPT
+
+
+def get_user_prompt(slide_num: int) -> str:
+    """Get the per-slide user prompt shared by all providers."""
+    return f"Analyze this slide (slide #{slide_num}) and extract issue information according to the format specified."
+
+
+class _AsyncRateLimiter:
+    """Spaces out request starts to at most `rps` per second (disabled when rps <= 0)."""
+    
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self._next_ok = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until the next request slot is available."""
+        if not self.interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_ok - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_ok = max(now, self._next_ok) + self.interval
+
 
 def create_ai_client(config: ProcessingConfig) -> BaseAIClient:
     """Factory function to create the appropriate AI client based on config."""
-    if config.ai_provider == AIProvider.OPENAI:
+    if config.ai_provider is AIProvider.OPENAI:
         return OpenAIClient(config)
-    elif config.ai_provider == AIProvider.GEMINI:
+    elif config.ai_provider is AIProvider.GEMINI:
         return GeminiClient(config)
     else:
         raise ValueError(f"Unsupported AI provider: {config.ai_provider}")
@@ -260,6 +371,7 @@ class AsyncAIAnalyzer:
         self.config = config
         self.ai_client = create_ai_client(config)
         self.manual_project_key = config.project_key
+        self._rate_limiter = _AsyncRateLimiter(config.max_requests_per_second)
         
         logger.info(f"Using {self.ai_client.provider_name} provider with model: {self.ai_client.model_name}")
         
@@ -271,17 +383,17 @@ class AsyncAIAnalyzer:
     async def analyze_slide(self, image_path: str, slide_num: int, predetermined_project_key: Optional[str] = None) -> SlideAnalysis:
         """Analyze slide image using AI API to extract issue details."""
         try:
-            base64_image = await self._encode_image_base64_async(image_path)
-            ai_response = await self.ai_client.analyze_image(base64_image, slide_num)
+            image_bytes = await self._read_image_bytes_async(image_path)
+            ai_response = await self._analyze_with_retry(image_bytes, slide_num)
             analysis_dict = self._parse_response(ai_response.content, slide_num)
             
             # Use manual override or pre-determined project key
             if self.manual_project_key:
                 project_key = self.manual_project_key
-                logger.debug(f"Using manual project key '{project_key}' for slide {slide_num}")
+                logger.debug("Using manual project key '%s' for slide %s", project_key, slide_num)
             else:
                 project_key = predetermined_project_key
-                logger.debug(f"Using pre-determined project key '{project_key}' for slide {slide_num}")
+                logger.debug("Using pre-determined project key '%s' for slide %s", project_key, slide_num)
             
             return SlideAnalysis(
                 slide_number=slide_num,
@@ -297,60 +409,95 @@ class AsyncAIAnalyzer:
             )
             
         except Exception as e:
-            logger.error(f"Error analyzing slide {slide_num} with AI: {e}")
+            logger.error("Error analyzing slide %s with AI: %s", slide_num, e)
             raise
     
-    async def analyze_slides_batch(self, slide_images: Dict[int, str], slide_project_mapping: Dict[int, str] = None) -> List[SlideAnalysis]:
-        """Analyze multiple slides in parallel with concurrency limit."""
+    async def _analyze_with_retry(self, image_bytes: bytes, slide_num: int) -> AIAnalysisResponse:
+        """Call the AI provider, backing off exponentially on retryable errors."""
+        for attempt in range(1, AI_MAX_ATTEMPTS + 1):
+            await self._rate_limiter.acquire()
+            try:
+                return await self.ai_client.analyze_image(image_bytes, slide_num)
+            except Exception as e:
+                if attempt == AI_MAX_ATTEMPTS or not self.ai_client.is_retryable_error(e):
+                    raise
+                delay = min(AI_RETRY_MAX_DELAY, AI_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                delay += random.uniform(0, 0.5)  # Jitter so concurrent slides don't retry in lockstep
+                logger.warning(
+                    "%s call for slide %s failed (attempt %s/%s): %s - retrying in %.1fs",
+                    self.ai_client.provider_name,
+                    slide_num,
+                    attempt,
+                    AI_MAX_ATTEMPTS,
+                    e,
+                    delay
+                )
+                await asyncio.sleep(delay)
+    
+    async def analyze_slides_stream(
+        self,
+        image_queue: asyncio.Queue,
+        slide_project_mapping: Dict[int, str] = None
+    ) -> AsyncIterator[SlideAnalysis]:
+        """Yield analyses in completion order for (slide_num, image_path) items on a queue.
+        
+        A None item ends the stream. Failed slides are logged and skipped, so
+        consumers such as Jira issue creation can start on each result at once.
+        """
         semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
         
         async def analyze_with_semaphore(slide_num: int, image_path: str) -> SlideAnalysis:
             async with semaphore:
                 predetermined_project = slide_project_mapping.get(slide_num) if slide_project_mapping else None
-                return await self.analyze_slide(image_path, slide_num, predetermined_project)
+                try:
+                    return await self.analyze_slide(image_path, slide_num, predetermined_project)
+                except Exception as e:
+                    logger.error("Failed to analyze slide %s: %s", slide_num, e)
+                    return None
         
-        tasks = [
-            analyze_with_semaphore(slide_num, image_path)
-            for slide_num, image_path in slide_images.items()
-        ]
-        
-        logger.info(f"Starting parallel analysis of {len(tasks)} slides (max {self.config.max_concurrent_requests} concurrent)")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out exceptions and log errors
-        successful_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                slide_num = list(slide_images.keys())[i]
-                logger.error(f"Failed to analyze slide {slide_num}: {result}")
-            else:
-                successful_results.append(result)
-        
-        return successful_results
+        image_done = asyncio.ensure_future(image_queue.get())
+        pending = {image_done}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is not image_done:
+                        if task.result() is not None:
+                            yield task.result()
+                        continue
+                    item = task.result()
+                    if item is not None:
+                        slide_num, image_path = item
+                        pending.add(asyncio.ensure_future(analyze_with_semaphore(slide_num, image_path)))
+                        image_done = asyncio.ensure_future(image_queue.get())
+                        pending.add(image_done)
+        finally:
+            # Don't leave analyses running if the consumer stops early or we are cancelled
+            for task in pending:
+                task.cancel()
     
-    async def _encode_image_base64_async(self, image_path: str) -> str:
-        """Encode image to base64 for AI API asynchronously."""
-        async with aiofiles.open(image_path, "rb") as f:
-            content = await f.read()
-            return base64.b64encode(content).decode('utf-8')
+    async def _read_image_bytes_async(self, image_path: str) -> bytes:
+        """Read image bytes for the AI API in a single executor call, shrinking oversized images."""
+        max_bytes = int(self.config.max_image_size_mb * 1024 * 1024)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _load_image_bytes, image_path, max_bytes)
     
     def _parse_response(self, content: str, slide_num: int) -> Dict:
         """Parse the AI response and extract JSON."""
-        logger.info(f"AI analysis for slide {slide_num} completed")
+        logger.info("AI analysis for slide %s completed", slide_num)
         
-        try:
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            json_str = content[json_start:json_end]
-            parsed = json.loads(json_str)
-            return parsed
-            
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.warning(f"Failed to parse JSON from AI response: {e}")
-            return {
-                "title": f"Issue from Slide {slide_num}",
-                "description": content,
-                "priority": "Medium",
-                "issue_type": "Task",
-                "labels": [f"slide-{slide_num}"]
-            }
+        # Try each "{" in turn, so a brace in prose before the object doesn't hide it
+        json_start = content.find('{')
+        while json_start != -1:
+            try:
+                parsed, _ = _JSON_DECODER.raw_decode(content, json_start)
+                return parsed
+            except json.JSONDecodeError:
+                json_start = content.find('{', json_start + 1)
+        
+        logger.warning("Failed to parse JSON from AI response for slide %s", slide_num)
+        fallback = _FALLBACK_TEMPLATE.copy()
+        fallback["title"] = f"Issue from Slide {slide_num}"
+        fallback["description"] = content
+        fallback["labels"] = [f"slide-{slide_num}"]
+        return fallback
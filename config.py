@@ -1,16 +1,29 @@
 """Configuration management for the PowerPoint to Jira converter."""
 
+import functools
 import os
-from dataclasses import dataclass
+import re
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Optional, Tuple
+from dotenv import find_dotenv, load_dotenv
+
+try:
+    import re2  # google-re2: linear-time matching, immune to catastrophic backtracking
+except ImportError:
+    re2 = None
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters fall back to __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 # Image processing constants
 DEFAULT_MAX_IMAGE_SIZE_MB = 2.0
 DEFAULT_JPEG_QUALITY = 85
 DEFAULT_IMAGE_SCALE = 1.5
 MIN_JPEG_QUALITY = 60
+JPEG_QUALITY_STEP = 5
+MAX_AI_IMAGE_EDGE = 2048  # Longest edge sent to AI providers; "high" detail gains nothing beyond it
 
 # OpenAI constants
 DEFAULT_OPENAI_MODEL = 'gpt-5.5'
@@ -19,6 +32,12 @@ DEFAULT_TIMEOUT = 30
 # Gemini constants
 DEFAULT_GEMINI_MODEL = 'gemini-3-flash-preview'
 
+# AI retry constants (exponential backoff on rate limits and transient errors)
+AI_MAX_ATTEMPTS = 3
+AI_RETRY_BASE_DELAY = 1.0
+AI_RETRY_MAX_DELAY = 30.0
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
 
 class AIProvider(Enum):
     """Supported AI providers."""
@@ -27,33 +46,130 @@ class AIProvider(Enum):
 
 # Processing constants
 PDF_CONVERSION_TIMEOUT = 120
+DEFAULT_UNOSERVER_HOST = '127.0.0.1'
+UNOCONVERT_COMMAND = 'unoconvert'
 MAX_CONCURRENT_REQUESTS = 5
+MAX_REQUESTS_PER_SECOND = 0.0  # AI request start rate cap; 0 disables
 
-# Issue detection patterns
+# Issue detection patterns (matched with ISSUE_PATTERN_FLAGS, i.e. case-insensitive)
 ISSUE_PATTERNS = [
-    r"(?i)(?:^|\n)issue:",           # "Issue:" at start of line (case-insensitive)
-    r"(?i)(?:^|\n)(bug):",           # "Bug:" at start of line (case-insensitive)
-    r"(?i)(?:^|\n)db issue:",        # "DB issue:" at start of line (case-insensitive)
-    r"(?i)(?:^|\n)coj issue:",        # "Cojudge issue:" at start of line (case-insensitive)
-    r"(?i)(?:^|\n)aj issue:",        # "Autojudge issue:" at start of line (case-insensitive)
-    r"(?i)(?:^|\n)New feature:",        # "Issue:" at start of line (case-insensitive)
+    r"(?:^|\n)issue:",           # "Issue:" at start of line
+    r"(?:^|\n)(bug):",           # "Bug:" at start of line
+    r"(?:^|\n)db issue:",        # "DB issue:" at start of line
+    r"(?:^|\n)coj issue:",        # "Cojudge issue:" at start of line
+    r"(?:^|\n)aj issue:",        # "Autojudge issue:" at start of line
+    r"(?:^|\n)New feature:",        # "New feature:" at start of line
 ]
+ISSUE_PATTERN_FLAGS = re.IGNORECASE
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a detection pattern with the given re flags.
+    
+    Uses RE2 when google-re2 is installed; patterns RE2 cannot express
+    (backreferences, lookaround) fall back to the re module.
+    """
+    # RE2 gets IGNORECASE as an inline flag; any other flag keeps the pattern on re
+    if re2 is not None and not flags & ~re.IGNORECASE:
+        try:
+            return re2.compile(("(?i)" if flags else "") + pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+
+# Global inline flags such as "(?i)", only valid at the very start of a pattern
+_LEADING_INLINE_FLAGS_RE = re.compile(r"\(\?([aiLmsux]+)\)")
+
+
+def _scope_inline_flags(pattern: str) -> str:
+    """Rewrite leading global inline flags as a scoped group: "(?i)x" -> "(?i:x)".
+    
+    Patterns are embedded in a fused alternation, where global flags would no longer
+    be at the start; the scoped form keeps them applying to this pattern only.
+    """
+    flags = ""
+    pos = 0
+    while True:
+        match = _LEADING_INLINE_FLAGS_RE.match(pattern, pos)
+        if match is None:
+            break
+        flags += match.group(1)
+        pos = match.end()
+    if not flags:
+        return pattern
+    return f"(?{flags}:{pattern[pos:]})"
+
+
+def compile_issue_patterns(patterns, flags: int = 0) -> re.Pattern:
+    """Fuse issue patterns into one alternation so a slide's text is scanned once.
+    
+    Caller-supplied patterns are compiled without flags, so they stay case-sensitive
+    unless they carry their own "(?i)".
+    """
+    return compile_pattern("|".join(f"(?:{_scope_inline_flags(p)})" for p in patterns), flags)
+
 
-# Rule-based project mapping for specific issue patterns
+# All issue patterns fused into one regex, compiled once at import
+ISSUE_RE = compile_issue_patterns(ISSUE_PATTERNS, ISSUE_PATTERN_FLAGS)
+
+# Rule-based project mapping for specific issue patterns (first matching rule wins;
+# matched with ISSUE_PATTERN_FLAGS)
 ISSUE_PROJECT_RULES = {
-    r"(?i)(?:^|\n)db issue:": "DB",
-    r"(?i)(?:^|\n)issue:": "AP",      # Explicit rule
-    r"(?i)(?:^|\n)(bug):": "AP",      # Explicit rule
-    r"(?i)(?:^|\n)coj issue:": "COJ",      # Explicit rule
-    r"(?i)(?:^|\n)aj issue:": "AJ",      # Explicit rule
-    r"(?i)(?:^|\n)New feature:": "AP",      # Explicit rule
+    r"(?:^|\n)db issue:": "DB",
+    r"(?:^|\n)issue:": "AP",      # Explicit rule
+    r"(?:^|\n)(bug):": "AP",      # Explicit rule
+    r"(?:^|\n)coj issue:": "COJ",      # Explicit rule
+    r"(?:^|\n)aj issue:": "AJ",      # Explicit rule
+    r"(?:^|\n)New feature:": "AP",      # Explicit rule
 }
 
+
+def compile_project_rules(rules, flags: int = 0) -> re.Pattern:
+    """Fuse project rule patterns into one regex; named group "r<N>" marks rule N."""
+    return compile_pattern(
+        "|".join(f"(?P<r{index}>{_scope_inline_flags(pattern)})" for index, pattern in enumerate(rules)),
+        flags
+    )
+
+
+# All project rules fused into one regex compiled at import
+_PROJECT_RULES_RE = compile_project_rules(ISSUE_PROJECT_RULES, ISSUE_PATTERN_FLAGS)
+_RULE_GROUP_INDEX = {f"r{index}": index for index in range(len(ISSUE_PROJECT_RULES))}
+_RULE_ITEMS = list(ISSUE_PROJECT_RULES.items())
+
+
+def match_project_rule(text: str) -> Optional[Tuple[str, str]]:
+    """Return (pattern, project key) of the highest-priority rule matching text, or None.
+
+    Scans the text once with the fused rule regex. Rule order in ISSUE_PROJECT_RULES
+    decides ties, so "db issue:" still wins over a generic "issue:" elsewhere on the slide.
+    """
+    best = None
+    for match in _PROJECT_RULES_RE.finditer(text):
+        index = _RULE_GROUP_INDEX[match.lastgroup]
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    return None if best is None else _RULE_ITEMS[best]
+
 # Default project key for issues that don't match any specific rules
 DEFAULT_PROJECT_KEY = "AP"
 
 
-@dataclass
+def _env_number(name: str, default, cast):
+    """Read a numeric environment variable, failing fast with a clear message."""
+    raw = os.getenv(name)
+    if raw is None or raw == '':
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {raw!r} (expected {cast.__name__})")
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ProcessingConfig:
     """Configuration for the processing pipeline."""
     # Jira settings (required)
@@ -74,19 +190,44 @@ class ProcessingConfig:
     # Processing settings
     max_image_size_mb: float = DEFAULT_MAX_IMAGE_SIZE_MB
     libreoffice_command: str = 'soffice'
+    unoserver_host: str = DEFAULT_UNOSERVER_HOST
+    unoserver_port: Optional[int] = None  # Set to convert through a running unoserver
     dry_run: bool = False
     debug: bool = False
     max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS
+    max_requests_per_second: float = MAX_REQUESTS_PER_SECOND
+    
+    # Derived in __post_init__ so current_model is a plain attribute read
+    _current_model: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        model = self.openai_model if self.ai_provider is AIProvider.OPENAI else self.gemini_model
+        object.__setattr__(self, '_current_model', model)
     
     @classmethod
     def from_env(cls, provider: Optional[str] = None) -> 'ProcessingConfig':
         """Load configuration from environment variables.
         
+        The result is frozen and memoized per provider and .env modification time,
+        so the .env file is only re-parsed after it changes. Use dataclasses.replace()
+        to derive a variant (e.g. with CLI overrides applied).
+        
         Args:
             provider: Optional AI provider override ('openai' or 'gemini').
                      If not specified, uses AI_PROVIDER env var or defaults to 'gemini'.
         """
-        load_dotenv(override=True)
+        dotenv_path = find_dotenv()
+        try:
+            env_mtime = os.stat(dotenv_path).st_mtime if dotenv_path else 0.0
+        except OSError:
+            env_mtime = 0.0
+        return cls._build_from_env(provider, dotenv_path, env_mtime)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=4)
+    def _build_from_env(cls, provider: Optional[str], dotenv_path: str, env_mtime: float) -> 'ProcessingConfig':
+        """Parse .env and the environment; cached on (provider, .env path, .env mtime)."""
+        load_dotenv(dotenv_path or None, override=True)
         
         # Determine AI provider
         provider_str = provider or os.getenv('AI_PROVIDER', 'gemini')
@@ -105,9 +246,12 @@ class ProcessingConfig:
             'openai_model': os.getenv('OPENAI_MODEL', DEFAULT_OPENAI_MODEL),
             'gemini_api_key': os.getenv('GEMINI_API_KEY'),
             'gemini_model': os.getenv('GEMINI_MODEL', DEFAULT_GEMINI_MODEL),
-            'max_image_size_mb': float(os.getenv('MAX_IMAGE_SIZE_MB', DEFAULT_MAX_IMAGE_SIZE_MB)),
+            'max_image_size_mb': _env_number('MAX_IMAGE_SIZE_MB', DEFAULT_MAX_IMAGE_SIZE_MB, float),
             'libreoffice_command': os.getenv('LIBREOFFICE_COMMAND', 'soffice'),
-            'max_concurrent_requests': int(os.getenv('MAX_CONCURRENT_REQUESTS', MAX_CONCURRENT_REQUESTS))
+            'unoserver_host': os.getenv('UNOSERVER_HOST', DEFAULT_UNOSERVER_HOST),
+            'unoserver_port': _env_number('UNOSERVER_PORT', None, int),
+            'max_concurrent_requests': _env_number('MAX_CONCURRENT_REQUESTS', MAX_CONCURRENT_REQUESTS, int),
+            'max_requests_per_second': _env_number('MAX_REQUESTS_PER_SECOND', MAX_REQUESTS_PER_SECOND, float)
         }
         
         # Validate required Jira config
@@ -117,9 +261,9 @@ class ProcessingConfig:
             raise ValueError(f"Missing required Jira environment variables: {missing}")
         
         # Validate API key for selected provider
-        if ai_provider == AIProvider.OPENAI and not config_dict.get('openai_api_key'):
+        if ai_provider is AIProvider.OPENAI and not config_dict.get('openai_api_key'):
             raise ValueError("OPENAI_API_KEY is required when using OpenAI provider")
-        if ai_provider == AIProvider.GEMINI and not config_dict.get('gemini_api_key'):
+        if ai_provider is AIProvider.GEMINI and not config_dict.get('gemini_api_key'):
             raise ValueError("GEMINI_API_KEY is required when using Gemini provider")
         
         config_instance = cls(**config_dict)
@@ -128,23 +272,28 @@ class ProcessingConfig:
     
     def print_config(self):
         """Print configuration settings with sensitive data masked."""
-        print("\n=== Configuration Settings ===")
-        print(f"JIRA Base URL: {self.base_url}")
-        print(f"JIRA Email: {self.email}")
-        print(f"Project Key: {self.project_key or 'Not set (using rules)'}")
-        print(f"AI Provider: {self.ai_provider.value}")
-        if self.ai_provider == AIProvider.OPENAI:
-            print(f"AI Model: {self.openai_model}")
+        lines = [
+            "\n=== Configuration Settings ===",
+            f"JIRA Base URL: {self.base_url}",
+            f"JIRA Email: {self.email}",
+            f"Project Key: {self.project_key or 'Not set (using rules)'}",
+            f"AI Provider: {self.ai_provider.value}",
+            f"AI Model: {self.current_model}",
+            f"Dry Run: {self.dry_run}",
+            f"Debug: {self.debug}",
+            f"Max Concurrent Requests: {self.max_concurrent_requests}",
+            f"Max Requests Per Second: {self.max_requests_per_second or 'Unlimited'}",
+        ]
+        if self.unoserver_port:
+            lines.append(f"PDF Conversion: unoserver at {self.unoserver_host}:{self.unoserver_port}")
         else:
-            print(f"AI Model: {self.gemini_model}")
-        print(f"Dry Run: {self.dry_run}")
-        print(f"Debug: {self.debug}")
-        print(f"Max Concurrent Requests: {self.max_concurrent_requests}")
-        print("==============================\n")
+            lines.append(f"PDF Conversion: {self.libreoffice_command}")
+        lines.append("==============================\n")
+        # One write keeps the block together when output is piped
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     @property
     def current_model(self) -> str:
         """Get the model name for the current AI provider."""
-        if self.ai_provider == AIProvider.OPENAI:
-            return self.openai_model
-        return self.gemini_model 
+        return self._current_model
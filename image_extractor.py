@@ -2,46 +2,98 @@
 
 import io
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 import fitz  # PyMuPDF
-from PIL import Image
+from PIL import Image, features
 
-from config import ProcessingConfig, DEFAULT_IMAGE_SCALE, DEFAULT_JPEG_QUALITY, MIN_JPEG_QUALITY
+from config import (
+    ProcessingConfig,
+    DEFAULT_IMAGE_SCALE,
+    DEFAULT_JPEG_QUALITY,
+    MIN_JPEG_QUALITY,
+    JPEG_QUALITY_STEP,
+)
 
 logger = logging.getLogger(__name__)
 
+# SIMD JPEG encoder; official Pillow wheels bundle it, some distro builds do not
+_LIBJPEG_TURBO = features.check_feature("libjpeg_turbo")
+
+# Render transform shared by every page
+_RENDER_MATRIX = fitz.Matrix(DEFAULT_IMAGE_SCALE, DEFAULT_IMAGE_SCALE)
+
 
 class ImageExtractor:
     """Handles extraction of slide images from PDF."""
     
     def __init__(self, config: ProcessingConfig):
         self.config = config
+        if not _LIBJPEG_TURBO:
+            logger.warning(
+                "Pillow is not built with libjpeg-turbo; slide JPEG encoding will be slower. "
+                "Install an official Pillow wheel, which bundles it."
+            )
     
-    def extract_slide_images(self, pdf_path: str, slide_page_mapping: Dict[int, int], output_dir: str) -> Dict[int, str]:
-        """Extract slide images using an explicit PPTX slide to PDF page mapping."""
+    def extract_slide_images(
+        self,
+        pdf_path: str,
+        slide_page_mapping: Dict[int, int],
+        output_dir: str,
+        on_image: Optional[Callable[[int, str], None]] = None
+    ) -> Dict[int, str]:
+        """Extract slide images using an explicit PPTX slide to PDF page mapping.
+        
+        Pages are rendered one at a time on the calling thread (PyMuPDF documents
+        are not thread-safe), while JPEG encoding runs in a thread pool, since
+        Pillow releases the GIL while encoding. Rendering waits while every
+        worker is busy, so at most max_workers rendered pages are held in memory.
+        
+        If given, on_image(slide_num, image_path) is called from the worker thread
+        as soon as each image is written, before this method returns.
+        """
         slide_images = {}
         
         try:
             doc = fitz.open(pdf_path)
             logger.info(f"PDF has {len(doc)} pages")
             
-            for slide_num, pdf_page_num in sorted(slide_page_mapping.items()):
-                page_index = pdf_page_num - 1
-                
-                if page_index >= len(doc):
-                    logger.warning(
-                        "Slide %s expects PDF page %s, but PDF only has %s pages",
-                        slide_num,
-                        pdf_page_num,
-                        len(doc),
+            out_dir = Path(output_dir)
+            max_workers = max(1, min(len(slide_page_mapping), os.cpu_count() or 1))
+            in_flight = threading.BoundedSemaphore(max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {}
+                for slide_num, pdf_page_num in sorted(slide_page_mapping.items()):
+                    page_index = pdf_page_num - 1
+                    
+                    if page_index >= len(doc):
+                        logger.warning(
+                            "Slide %s expects PDF page %s, but PDF only has %s pages",
+                            slide_num,
+                            pdf_page_num,
+                            len(doc),
+                        )
+                        continue
+                    
+                    in_flight.acquire()
+                    pil_img = self._render_page(doc, slide_num, page_index)
+                    if pil_img is None:
+                        in_flight.release()
+                        continue
+                    future = pool.submit(
+                        self._save_slide_image, pil_img, slide_num, out_dir / f"slide_{slide_num}.jpg", on_image
                     )
-                    continue
+                    future.add_done_callback(lambda _: in_flight.release())
+                    futures[slide_num] = future
                 
-                img_path = self._extract_single_slide(doc, slide_num, page_index, output_dir)
-                if img_path:
-                    slide_images[slide_num] = img_path
+                for slide_num, future in futures.items():
+                    img_path = future.result()
+                    if img_path:
+                        slide_images[slide_num] = img_path
             
             doc.close()
             return slide_images
@@ -50,39 +102,80 @@ class ImageExtractor:
             logger.error(f"Error extracting slide images: {e}")
             raise
     
-    def _extract_single_slide(self, doc, slide_num: int, page_index: int, output_dir: str) -> Optional[str]:
-        """Extract a single slide as an optimized JPEG."""
+    def _render_page(self, doc, slide_num: int, page_index: int) -> Optional[Image.Image]:
+        """Render a single PDF page to an RGB image.
+        
+        The samples are copied into Pillow here, on the rendering thread, so the
+        pixmap is freed before the next MuPDF call rather than on an encoder thread.
+        """
         try:
             page = doc.load_page(page_index)
-            mat = fitz.Matrix(DEFAULT_IMAGE_SCALE, DEFAULT_IMAGE_SCALE)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            
-            img_filename = f"slide_{slide_num}.jpg"
-            img_path = Path(output_dir) / img_filename
+            pix = page.get_pixmap(matrix=_RENDER_MATRIX, alpha=False)
+            # Copy the RGB samples straight into Pillow, without a PPM serialize/parse round trip
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride)
+        except Exception as e:
+            logger.error(f"Error rendering slide {slide_num}: {e}")
+            return None
+    
+    def _save_slide_image(
+        self,
+        pil_img: Image.Image,
+        slide_num: int,
+        img_path: Path,
+        on_image: Optional[Callable[[int, str], None]] = None
+    ) -> Optional[str]:
+        """Encode a rendered slide as an optimized JPEG and write it to img_path."""
+        try:
+            quality, jpeg_data = self._optimize_image_quality(pil_img)
             
-            img_data = pix.tobytes("ppm")
-            with Image.open(io.BytesIO(img_data)) as pil_img:
-                quality = self._optimize_image_quality(pil_img, img_path)
-                
-                file_size_mb = img_path.stat().st_size / (1024 * 1024)
-                logger.info(f"Extracted slide {slide_num} as JPEG ({file_size_mb:.1f}MB, quality={quality})")
+            img_path.write_bytes(jpeg_data)
+            file_size_mb = len(jpeg_data) / (1024 * 1024)
+            logger.info(f"Extracted slide {slide_num} as JPEG ({file_size_mb:.1f}MB, quality={quality})")
             
+            if on_image is not None:
+                on_image(slide_num, str(img_path))
             return str(img_path)
             
         except Exception as e:
             logger.error(f"Error extracting slide {slide_num}: {e}")
             return None
     
-    def _optimize_image_quality(self, pil_img: Image.Image, img_path: Path) -> int:
-        """Optimize JPEG quality to meet size constraints."""
-        quality = DEFAULT_JPEG_QUALITY
+    def _optimize_image_quality(self, pil_img: Image.Image) -> Tuple[int, bytes]:
+        """Find the highest JPEG quality that meets the size limit, encoding in memory.
         
-        while quality >= MIN_JPEG_QUALITY:
-            pil_img.save(img_path, "JPEG", quality=quality, optimize=True)
-            
-            file_size_mb = img_path.stat().st_size / (1024 * 1024)
-            if file_size_mb <= self.config.max_image_size_mb:
-                break
-            quality -= 10
+        Returns the chosen quality and the encoded bytes. If even MIN_JPEG_QUALITY
+        is too large, the MIN_JPEG_QUALITY encoding is returned.
+        """
+        max_bytes = self.config.max_image_size_mb * 1024 * 1024
+        
+        # Most slides fit at the default quality, so try it (fully optimized) before searching
+        jpeg_data = self._encode_jpeg(pil_img, DEFAULT_JPEG_QUALITY)
+        if len(jpeg_data) <= max_bytes:
+            return DEFAULT_JPEG_QUALITY, jpeg_data
         
-        return quality 
+        # Binary search the remaining qualities for the highest one that fits. Probes skip
+        # the Huffman optimization pass, which only ever shrinks the output, so a probe
+        # that fits stays within the limit once re-encoded with optimize=True.
+        candidates = list(range(MIN_JPEG_QUALITY, DEFAULT_JPEG_QUALITY, JPEG_QUALITY_STEP))
+        best = None
+        lo, hi = 0, len(candidates) - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            probe = self._encode_jpeg(pil_img, candidates[mid], optimize=False)
+            if len(probe) <= max_bytes:
+                best = (candidates[mid], probe)
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        
+        quality, probe = best or (MIN_JPEG_QUALITY, None)
+        jpeg_data = self._encode_jpeg(pil_img, quality)
+        if probe is not None and len(probe) < len(jpeg_data):
+            jpeg_data = probe
+        return quality, jpeg_data
+    
+    def _encode_jpeg(self, pil_img: Image.Image, quality: int, optimize: bool = True) -> bytes:
+        """Encode an image as JPEG into memory."""
+        buffer = io.BytesIO()
+        pil_img.save(buffer, "JPEG", quality=quality, optimize=optimize)
+        return buffer.getvalue()
\ No newline at end of file
@@ -2,17 +2,83 @@
 
 import asyncio
 import logging
+import re
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
 
-import aiofiles
 import aiohttp
 
+try:
+    import orjson  # Faster JSON that serializes straight to bytes
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    
+    _json_loads = json.loads
+
 from config import ProcessingConfig, DEFAULT_TIMEOUT
 from ai_analyzer import SlideAnalysis
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Socket-level timeouts only: time spent queued for a pooled connection must not count,
+# since the connector limit is what throttles concurrent requests
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=DEFAULT_TIMEOUT, sock_read=DEFAULT_TIMEOUT)
+
+# Markdown block markers understood by _create_adf_content, matched against a stripped paragraph
+_ADF_BLOCK_RE = re.compile(r'(?P<h1># )|(?P<h2>## )|(?P<bold>\*\*(?s:.+)\*\*\Z)')
+
+# ADF node skeletons; the per-paragraph "content" list is added to a copy
+_ADF_H1_TEMPLATE = {"type": "heading", "attrs": {"level": 1}}
+_ADF_H2_TEMPLATE = {"type": "heading", "attrs": {"level": 2}}
+_ADF_PARAGRAPH_TEMPLATE = {"type": "paragraph"}
+_ADF_STRONG_MARKS = [{"type": "strong"}]
+
+
+def _adf_h1(stripped: str) -> Dict:
+    return {**_ADF_H1_TEMPLATE, "content": [{"type": "text", "text": stripped[2:]}]}
+
+
+def _adf_h2(stripped: str) -> Dict:
+    return {**_ADF_H2_TEMPLATE, "content": [{"type": "text", "text": stripped[3:]}]}
+
+
+def _adf_bold(stripped: str) -> Dict:
+    return {**_ADF_PARAGRAPH_TEMPLATE, "content": [
+        {"type": "text", "text": stripped[2:-2], "marks": _ADF_STRONG_MARKS}
+    ]}
+
+
+def _adf_paragraph(stripped: str) -> Dict:
+    return {**_ADF_PARAGRAPH_TEMPLATE, "content": [{"type": "text", "text": stripped}]}
+
+
+# Block builders keyed by the _ADF_BLOCK_RE group that matched (None for plain paragraphs)
+_ADF_BUILDERS = {'h1': _adf_h1, 'h2': _adf_h2, 'bold': _adf_bold, None: _adf_paragraph}
+
+
+def _adf_block(stripped: str) -> Dict:
+    """Build the ADF node for one stripped, non-empty markdown paragraph."""
+    match = _ADF_BLOCK_RE.match(stripped)
+    return _ADF_BUILDERS[match.lastgroup if match else None](stripped)
+
+
+async def _as_async_iter(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    """Iterate a plain or async iterable with async for."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
 
 class AsyncJiraClient:
     """Handles async Jira API operations."""
@@ -20,6 +86,43 @@ class AsyncJiraClient:
     def __init__(self, config: ProcessingConfig):
         self.config = config
         self.auth = aiohttp.BasicAuth(config.email, config.api_token)
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> 'AsyncJiraClient':
+        """Open one pooled session shared by issue creation and attachment uploads."""
+        self._session = self._create_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create an authenticated session with DNS caching and the request timeout.
+        
+        The connector pool is what caps concurrent Jira requests: requests beyond
+        max_concurrent_requests wait for a free connection.
+        """
+        limit = self.config.max_concurrent_requests
+        return aiohttp.ClientSession(
+            auth=self.auth,
+            timeout=_REQUEST_TIMEOUT,
+            connector=aiohttp.TCPConnector(
+                limit=limit,
+                limit_per_host=limit,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+        )
+    
+    @asynccontextmanager
+    async def _borrow_session(self):
+        """Yield the shared session, or a temporary one when used outside `async with`."""
+        if self._session is not None:
+            yield self._session
+        else:
+            async with self._create_session() as session:
+                yield session
     
     async def create_issue(self, analysis: SlideAnalysis, session: aiohttp.ClientSession) -> str:
         """Create Jira issue from analysis asynchronously."""
@@ -44,12 +147,11 @@ class AsyncJiraClient:
         try:
             async with session.post(
                 f"{self.config.base_url}/rest/api/3/issue",
-                json=payload,
-                auth=self.auth,
-                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
+                data=_json_dumps(payload),
+                headers=_JSON_HEADERS
             ) as response:
                 response.raise_for_status()
-                result = await response.json()
+                result = _json_loads(await response.read())
                 issue_key = result['key']
                 logger.info(f"Created Jira issue {issue_key} in project {analysis.project_key} for slide {analysis.slide_number}")
                 return issue_key
@@ -63,102 +165,76 @@ class AsyncJiraClient:
         try:
             img_path = Path(image_path)
             
-            # Read file asynchronously
-            async with aiofiles.open(image_path, 'rb') as f:
-                file_content = await f.read()
-            
-            # Create multipart data
-            data = aiohttp.FormData()
-            data.add_field('file', file_content, filename=img_path.name, content_type='image/jpeg')
-            
-            async with session.post(
-                f"{self.config.base_url}/rest/api/3/issue/{issue_key}/attachments",
-                data=data,
-                auth=self.auth,
-                headers={'X-Atlassian-Token': 'no-check'},
-                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
-            ) as response:
-                response.raise_for_status()
-                logger.info(f"Attached slide image {img_path.name} to {issue_key}")
+            # Hand aiohttp the open file so it is streamed in chunks with a known
+            # Content-Length instead of being read into memory first
+            with open(img_path, 'rb') as f:
+                data = aiohttp.FormData()
+                data.add_field('file', f, filename=img_path.name, content_type='image/jpeg')
+                
+                async with session.post(
+                    f"{self.config.base_url}/rest/api/3/issue/{issue_key}/attachments",
+                    data=data,
+                    headers={'X-Atlassian-Token': 'no-check'}
+                ) as response:
+                    response.raise_for_status()
+                    logger.info(f"Attached slide image {img_path.name} to {issue_key}")
                 
         except Exception as e:
             logger.warning(f"Failed to attach slide image to {issue_key}: {e}")
     
-    async def create_issues_batch(self, analyses: List[SlideAnalysis]) -> List[SlideAnalysis]:
-        """Create multiple Jira issues in parallel."""
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
-        
-        async with aiohttp.ClientSession() as session:
-            async def create_with_semaphore(analysis: SlideAnalysis) -> SlideAnalysis:
-                async with semaphore:
-                    try:
-                        issue_key = await self.create_issue(analysis, session)
-                        analysis.jira_key = issue_key
-                        return analysis
-                    except Exception as e:
-                        logger.error(f"Failed to create issue for slide {analysis.slide_number}: {e}")
-                        return analysis
-            
-            tasks = [create_with_semaphore(analysis) for analysis in analyses]
-            logger.info(f"Creating {len(tasks)} Jira issues in parallel (max {self.config.max_concurrent_requests} concurrent)")
-            return await asyncio.gather(*tasks)
+    async def _create_issue_safe(self, analysis: SlideAnalysis, session: aiohttp.ClientSession) -> SlideAnalysis:
+        """Create the issue and record its key; failures are logged and leave jira_key unset."""
+        try:
+            analysis.jira_key = await self.create_issue(analysis, session)
+        except Exception as e:
+            logger.error(f"Failed to create issue for slide {analysis.slide_number}: {e}")
+        return analysis
     
-    async def attach_images_batch(self, analyses: List[SlideAnalysis], slide_images: Dict[int, str]):
-        """Attach images to multiple Jira issues in parallel."""
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+    async def create_issues_and_attach(
+        self,
+        analyses: Union[Iterable[SlideAnalysis], AsyncIterable[SlideAnalysis]],
+        slide_images: Dict[int, str]
+    ) -> List[SlideAnalysis]:
+        """Create an issue per analysis and attach its slide image as soon as the issue exists.
         
-        async with aiohttp.ClientSession() as session:
-            async def attach_with_semaphore(analysis: SlideAnalysis):
+        analyses may be an async iterable (e.g. AI results as they complete), in which
+        case each issue is created as soon as its analysis arrives. Every item runs
+        create -> attach on its own, sharing the session's connection pool, so no
+        phase waits for the whole batch. Returns the analyses in the order received.
+        """
+        async with self._borrow_session() as session:
+            async def create_then_attach(analysis: SlideAnalysis):
+                await self._create_issue_safe(analysis, session)
                 if analysis.jira_key and analysis.slide_number in slide_images:
-                    async with semaphore:
-                        await self.attach_image(
-                            analysis.jira_key, 
-                            slide_images[analysis.slide_number], 
-                            session
-                        )
+                    await self.attach_image(analysis.jira_key, slide_images[analysis.slide_number], session)
             
-            valid_analyses = [a for a in analyses if a.jira_key and a.slide_number in slide_images]
-            tasks = [attach_with_semaphore(analysis) for analysis in valid_analyses]
-            
-            if tasks:
-                logger.info(f"Attaching {len(tasks)} images in parallel")
+            received = []
+            tasks = []
+            try:
+                async for analysis in _as_async_iter(analyses):
+                    received.append(analysis)
+                    tasks.append(asyncio.ensure_future(create_then_attach(analysis)))
+                
+                logger.info(f"Waiting for {len(tasks)} Jira issues and attachments")
                 await asyncio.gather(*tasks, return_exceptions=True)
+            except BaseException:
+                # Don't leave requests running if we are cancelled mid-stream; wait for them
+                # to stop before the session closes, then report what already exists in Jira
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                created = [analysis.jira_key for analysis in received if analysis.jira_key]
+                if created:
+                    logger.warning(f"Stopped early; Jira issues already created: {', '.join(created)}")
+                raise
+        
+        return received
     
     def _create_adf_content(self, text: str) -> Dict:
         """Convert markdown text to Atlassian Document Format."""
-        if not text.strip():
-            return {"type": "doc", "version": 1, "content": []}
-        
-        paragraphs = text.split('\n\n')
-        content = []
-        
-        for para in paragraphs:
-            if para.strip():
-                if para.strip().startswith('# '):
-                    content.append({
-                        "type": "heading",
-                        "attrs": {"level": 1},
-                        "content": [{"type": "text", "text": para.strip()[2:]}]
-                    })
-                elif para.strip().startswith('## '):
-                    content.append({
-                        "type": "heading", 
-                        "attrs": {"level": 2},
-                        "content": [{"type": "text", "text": para.strip()[3:]}]
-                    })
-                elif para.strip().startswith('**') and para.strip().endswith('**'):
-                    content.append({
-                        "type": "paragraph",
-                        "content": [{
-                            "type": "text",
-                            "text": para.strip()[2:-2],
-                            "marks": [{"type": "strong"}]
-                        }]
-                    })
-                else:
-                    content.append({
-                        "type": "paragraph",
-                        "content": [{"type": "text", "text": para.strip()}]
-                    })
-        
-        return {"type": "doc", "version": 1, "content": content} 
\ No newline at end of file
+        content = [
+            _adf_block(stripped)
+            for stripped in map(str.strip, text.split('\n\n'))
+            if stripped
+        ]
+        return {"type": "doc", "version": 1, "content": content}
\ No newline at end of file
@@ -8,12 +8,14 @@ All components are separated into focused, maintainable modules.
 
 import asyncio
 import argparse
+import dataclasses
 import logging
+import sys
+import time
 from pathlib import Path
 from typing import List
 
 from config import ProcessingConfig, MAX_CONCURRENT_REQUESTS
-from processor import AsyncPowerPointToJiraProcessor
 from ai_analyzer import SlideAnalysis
 
 # Setup logging
@@ -30,31 +32,37 @@ def print_results(results: List[SlideAnalysis], dry_run: bool = False):
     total_input_tokens = sum(result.input_tokens for result in results)
     total_output_tokens = sum(result.output_tokens for result in results)
     total_tokens = sum(result.total_tokens for result in results)
+    separator = '=' * 60
     
+    # Build each slide's block and write it in one call instead of one print per field
     for result in results:
-        print(f"\n{'='*60}")
-        print(f"Slide {result.slide_number}: {result.title}")
-        print(f"Project: {result.project_key}")
-        print(f"Priority: {result.priority}")
-        print(f"Type: {result.issue_type}")
+        lines = [
+            f"\n{separator}",
+            f"Slide {result.slide_number}: {result.title}",
+            f"Project: {result.project_key}",
+            f"Priority: {result.priority}",
+            f"Type: {result.issue_type}",
+        ]
         if result.total_tokens:
-            print(
+            lines.append(
                 "Image recognition tokens: "
                 f"input={result.input_tokens}, output={result.output_tokens}, total={result.total_tokens}"
             )
         if not dry_run and result.jira_key:
-            print(f"Jira Issue: {result.jira_key}")
-        print(f"Description:\n{result.description}")
-        print(f"Labels: {', '.join(result.labels)}")
+            lines.append(f"Jira Issue: {result.jira_key}")
+        lines.append(f"Description:\n{result.description}")
+        lines.append(f"Labels: {', '.join(result.labels)}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     if total_tokens:
-        print(f"\n{'='*60}")
-        print("Token Usage Summary")
-        print(
+        sys.stdout.write(
+            f"\n{separator}\n"
+            "Token Usage Summary\n"
             "Image recognition total: "
-            f"input={total_input_tokens}, output={total_output_tokens}, total={total_tokens}"
+            f"input={total_input_tokens}, output={total_output_tokens}, total={total_tokens}\n"
+            "Jira ticket creation total: 0 tokens (Jira REST API call, no LLM usage)\n"
         )
-        print("Jira ticket creation total: 0 tokens (Jira REST API call, no LLM usage)")
+    sys.stdout.flush()
 
 
 def create_argument_parser():
@@ -88,12 +96,15 @@ async def async_main():
     
     try:
         config = ProcessingConfig.from_env(provider=args.provider)
-        config.dry_run = args.dry_run
-        config.debug = args.debug
-        config.max_concurrent_requests = args.max_concurrent
+        config = dataclasses.replace(
+            config,
+            dry_run=args.dry_run,
+            debug=args.debug,
+            max_concurrent_requests=args.max_concurrent
+        )
         
         if args.project_key:
-            config.project_key = args.project_key
+            config = dataclasses.replace(config, project_key=args.project_key)
             logger.info(f"Using manual project key from command line: {args.project_key}")
             logger.info("Rule-based project determination disabled due to manual override")
         elif config.project_key:
@@ -110,13 +121,17 @@ async def async_main():
             
         logger.info(f"Max concurrent requests: {config.max_concurrent_requests}")
         
+        # Imported late: the pipeline pulls in PyMuPDF, python-pptx and aiohttp, which
+        # --help, a missing file or a bad .env should not have to load
+        from processor import AsyncPowerPointToJiraProcessor
+        
         # Create and run the processor
         processor = AsyncPowerPointToJiraProcessor(config)
         
         # Measure total processing time
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
         results = await processor.process(args.pptx_file)
-        total_time = asyncio.get_event_loop().time() - start_time
+        total_time = time.perf_counter() - start_time
         
         print_results(results, args.dry_run)
         logger.info(f"Total processing time: {total_time:.2f} seconds")
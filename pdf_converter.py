@@ -4,7 +4,7 @@ import subprocess
 import logging
 from pathlib import Path
 
-from config import ProcessingConfig, PDF_CONVERSION_TIMEOUT
+from config import ProcessingConfig, PDF_CONVERSION_TIMEOUT, UNOCONVERT_COMMAND
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +16,11 @@ class PDFConverter:
         self.config = config
     
     def convert_to_pdf(self, pptx_path: str, output_dir: str) -> str:
-        """Convert PowerPoint to PDF using LibreOffice headless mode."""
+        """Convert PowerPoint to PDF using LibreOffice headless mode.
+        
+        When UNOSERVER_PORT is set the file is sent to an already running unoserver,
+        which skips LibreOffice's cold start; on failure a one-off soffice is used.
+        """
         pptx_path = Path(pptx_path).resolve()
         output_dir = Path(output_dir).resolve()
         
@@ -25,6 +29,52 @@ class PDFConverter:
         
         logger.info(f"Converting {pptx_path.name} to PDF...")
         
+        pdf_name = pptx_path.stem + ".pdf"
+        pdf_path = output_dir / pdf_name
+        
+        stderr = None
+        if not (self.config.unoserver_port and self._convert_with_unoserver(pptx_path, pdf_path)):
+            stderr = self._convert_with_soffice(pptx_path, output_dir)
+        
+        if not pdf_path.exists():
+            raise RuntimeError(f"PDF conversion failed - output file not found: {pdf_path}")
+        
+        if pdf_path.stat().st_size == 0:
+            raise RuntimeError(f"PDF conversion failed - output file is empty (0 bytes): {pdf_path}\nLibreOffice may have crashed. stderr: {stderr}")
+        
+        logger.info(f"Successfully converted to: {pdf_path}")
+        return str(pdf_path)
+    
+    def _convert_with_unoserver(self, pptx_path: Path, pdf_path: Path) -> bool:
+        """Convert through a running unoserver; return False if the caller should fall back."""
+        cmd = [
+            UNOCONVERT_COMMAND,
+            "--host", self.config.unoserver_host,
+            "--port", str(self.config.unoserver_port),
+            "--convert-to", "pdf",
+            str(pptx_path),
+            str(pdf_path)
+        ]
+        
+        try:
+            subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=PDF_CONVERSION_TIMEOUT,
+                check=True
+            )
+            return True
+        except subprocess.TimeoutExpired:
+            logger.warning("unoserver conversion timed out, falling back to soffice")
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"unoserver conversion failed, falling back to soffice: {e.stderr}")
+        except FileNotFoundError:
+            logger.warning(f"'{UNOCONVERT_COMMAND}' not found (pip install unoserver), falling back to soffice")
+        return False
+    
+    def _convert_with_soffice(self, pptx_path: Path, output_dir: Path) -> str:
+        """Convert by starting a one-off headless LibreOffice; returns its stderr."""
         cmd = [
             self.config.libreoffice_command,
             "--headless",
@@ -41,18 +91,7 @@ class PDFConverter:
                 timeout=PDF_CONVERSION_TIMEOUT,
                 check=True
             )
-            
-            pdf_name = pptx_path.stem + ".pdf"
-            pdf_path = output_dir / pdf_name
-            
-            if not pdf_path.exists():
-                raise RuntimeError(f"PDF conversion failed - output file not found: {pdf_path}")
-            
-            if pdf_path.stat().st_size == 0:
-                raise RuntimeError(f"PDF conversion failed - output file is empty (0 bytes): {pdf_path}\nLibreOffice may have crashed. stderr: {result.stderr}")
-            
-            logger.info(f"Successfully converted to: {pdf_path}")
-            return str(pdf_path)
+            return result.stderr
             
         except subprocess.TimeoutExpired:
             raise RuntimeError("LibreOffice conversion timed out")
@@ -2,13 +2,18 @@
 
 import asyncio
 import logging
+import os
 import shutil
-from typing import List
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from pathlib import Path
 from contextlib import contextmanager
 from config import ProcessingConfig
 from ai_analyzer import SlideAnalysis
-from slide_detector import SlideDetector
+from slide_detector import IssueSlideReference, SlideDetector
 from pdf_converter import PDFConverter
 from image_extractor import ImageExtractor
 from ai_analyzer import AsyncAIAnalyzer
@@ -17,6 +22,27 @@ from jira_client import AsyncJiraClient
 logger = logging.getLogger(__name__)
 
 
+def _remove_in_background(workdir: str):
+    """Delete a directory tree without blocking the caller.
+    
+    The tree is first renamed to a unique sibling, so a new run can recreate
+    workdir straight away. The deleting thread is not a daemon, so the
+    interpreter still waits for it at exit and nothing is left behind.
+    """
+    doomed = f"{workdir}.deleting-{uuid.uuid4().hex}"
+    try:
+        os.rename(workdir, doomed)
+    except OSError:
+        shutil.rmtree(workdir, ignore_errors=True)
+        return
+    threading.Thread(
+        target=shutil.rmtree,
+        args=(doomed,),
+        kwargs={"ignore_errors": True},
+        name="workdir-cleanup"
+    ).start()
+
+
 @contextmanager
 def temp_workdir(pptx_path: str, debug: bool = False):
     """Context manager for temporary directory with automatic cleanup."""
@@ -34,8 +60,8 @@ def temp_workdir(pptx_path: str, debug: bool = False):
         yield workdir
     finally:
         if not debug:
-            shutil.rmtree(workdir, ignore_errors=True)
-            logger.info(f"Cleaned up temp directory: {workdir}")
+            _remove_in_background(workdir)
+            logger.info(f"Removing temp directory in background: {workdir}")
         else:
             logger.info(f"Debug mode: Keeping temp files in {workdir}")
 
@@ -57,8 +83,8 @@ class AsyncPowerPointToJiraProcessor:
         
         with temp_workdir(pptx_path, self.config.debug) as workdir:
             try:
-                # Step 1: Find issue slides with project determination (synchronous)
-                issue_slides = list(self.slide_detector.find_issue_slides(pptx_path))
+                # Steps 1-2: Find issue slides, converting to PDF alongside the scan
+                issue_slides, pdf_path = await self._detect_and_convert(pptx_path, workdir)
                 if not issue_slides:
                     logger.info("No issue slides found")
                     return results
@@ -76,38 +102,124 @@ class AsyncPowerPointToJiraProcessor:
                 logger.info(f"Project mapping: {slide_project_mapping}")
                 logger.info(f"PDF page mapping: {slide_pdf_mapping}")
                 
-                # Step 2: Convert to PDF (synchronous)
-                pdf_path = self.pdf_converter.convert_to_pdf(pptx_path, workdir)
+                # Steps 3-6: Extract slide images, analyze each one as soon as it is written
+                # and (unless dry run) create its Jira issue and attach its image as soon
+                # as its analysis is ready
+                logger.info("Starting image extraction, AI analysis and Jira issue creation...")
+                start_time = time.perf_counter()
                 
-                # Step 3: Extract slide images (synchronous)
-                slide_images = self.image_extractor.extract_slide_images(
-                    pdf_path, slide_pdf_mapping, workdir
+                analyses = await self._run_slide_pipeline(
+                    pdf_path, slide_pdf_mapping, slide_project_mapping, workdir
                 )
                 
-                # Step 4: Analyze all slides in parallel (asynchronous)
-                logger.info("Starting parallel AI analysis...")
-                start_time = asyncio.get_event_loop().time()
-                
-                analyses = await self.ai_analyzer.analyze_slides_batch(slide_images, slide_project_mapping)
-                
-                analysis_time = asyncio.get_event_loop().time() - start_time
-                logger.info(f"Completed AI analysis in {analysis_time:.2f} seconds")
-                
-                # Step 5: Create Jira issues in parallel (if not dry run)
-                if not self.config.dry_run and analyses:
-                    logger.info("Starting parallel Jira issue creation...")
-                    start_time = asyncio.get_event_loop().time()
-                    
-                    analyses = await self.jira_client.create_issues_batch(analyses)
-                    
-                    # Step 6: Attach images in parallel
-                    await self.jira_client.attach_images_batch(analyses, slide_images)
-                    
-                    jira_time = asyncio.get_event_loop().time() - start_time
-                    logger.info(f"Completed Jira operations in {jira_time:.2f} seconds")
+                pipeline_time = time.perf_counter() - start_time
+                logger.info(f"Completed slide pipeline in {pipeline_time:.2f} seconds")
                 
                 return analyses
                 
             except Exception as e:
                 logger.error(f"Error in processing pipeline: {e}")
-                raise 
+                raise
+    
+    async def _detect_and_convert(
+        self, pptx_path: str, workdir: str
+    ) -> Tuple[List[IssueSlideReference], Optional[str]]:
+        """Detect issue slides, starting PDF conversion as soon as the first one is found.
+        
+        The rest of the deck is scanned while LibreOffice runs, and decks without
+        issue slides never pay for a conversion (pdf_path is then None).
+        """
+        loop = asyncio.get_running_loop()
+        conversion_pool = ThreadPoolExecutor(max_workers=1)
+        conversions = []  # The PDF conversion future, once submitted
+        
+        def detect():
+            issue_slides = []
+            for issue_slide in self.slide_detector.find_issue_slides(pptx_path):
+                if not conversions:
+                    conversions.append(conversion_pool.submit(
+                        self.pdf_converter.convert_to_pdf, pptx_path, workdir
+                    ))
+                issue_slides.append(issue_slide)
+            return issue_slides
+        
+        try:
+            issue_slides = await loop.run_in_executor(None, detect)
+            if not conversions:
+                return issue_slides, None
+            return issue_slides, await asyncio.wrap_future(conversions[0])
+        except BaseException:
+            # Let a running conversion finish before the temp directory can be removed
+            # under soffice, waiting without blocking the event loop
+            if conversions:
+                await asyncio.wait([asyncio.wrap_future(conversions[0])])
+            raise
+        finally:
+            conversion_pool.shutdown(wait=False)
+    
+    async def _run_slide_pipeline(
+        self,
+        pdf_path: str,
+        slide_pdf_mapping: Dict[int, int],
+        slide_project_mapping: Dict[int, str],
+        workdir: str
+    ) -> List[SlideAnalysis]:
+        """Chain extract -> analyze -> create issue -> attach image per slide.
+        
+        Image extraction runs in a worker thread and reports each image through a
+        queue as it is written; each AI result is handed straight to the Jira client.
+        Returns the successful analyses in slide order.
+        """
+        loop = asyncio.get_running_loop()
+        image_queue = asyncio.Queue()
+        slide_images = {}
+        
+        def image_ready(slide_num: int, image_path: str):
+            slide_images[slide_num] = image_path
+            image_queue.put_nowait((slide_num, image_path))
+        
+        def on_image(slide_num: int, image_path: str):
+            loop.call_soon_threadsafe(image_ready, slide_num, image_path)
+        
+        extraction = loop.run_in_executor(
+            None,
+            self.image_extractor.extract_slide_images,
+            pdf_path,
+            slide_pdf_mapping,
+            workdir,
+            on_image
+        )
+        # Every on_image call is queued before the extractor returns, so the end
+        # marker always lands after the last image
+        extraction.add_done_callback(lambda _: image_queue.put_nowait(None))
+        
+        stream = self.ai_analyzer.analyze_slides_stream(image_queue, slide_project_mapping)
+        if self.config.dry_run:
+            consumer = self._collect(stream)
+        else:
+            consumer = self._file_in_jira(stream, slide_images)
+        consumer = asyncio.ensure_future(consumer)
+        
+        try:
+            await extraction
+        except BaseException:
+            consumer.cancel()
+            # Let the consumer stop its requests and close the Jira session before the
+            # extraction error propagates; its own CancelledError is swallowed here
+            await asyncio.gather(consumer, return_exceptions=True)
+            raise
+        analyses = await consumer
+        analyses.sort(key=lambda analysis: analysis.slide_number)
+        return analyses
+    
+    async def _collect(self, stream: AsyncIterator[SlideAnalysis]) -> List[SlideAnalysis]:
+        """Gather the analysis stream without touching Jira (dry run)."""
+        return [analysis async for analysis in stream]
+    
+    async def _file_in_jira(
+        self, stream: AsyncIterator[SlideAnalysis], slide_images: Dict[int, str]
+    ) -> List[SlideAnalysis]:
+        """Create a Jira issue and attach its image for each analysis as it arrives."""
+        # One pooled Jira session is shared by issue creation and attachment
+        async with self.jira_client:
+            return await self.jira_client.create_issues_and_attach(stream, slide_images)
@@ -1,15 +1,56 @@
 """Slide detection functionality."""
 
+import functools
 import logging
-import re
+import os
+import posixpath
+import zipfile
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Generator, List, Optional
-from pptx import Presentation
+from typing import Dict, Generator, Iterator, List, Optional, Tuple
+from lxml import etree
 
-from config import ISSUE_PATTERNS, ISSUE_PROJECT_RULES, DEFAULT_PROJECT_KEY
+from config import (
+    ISSUE_PATTERNS,
+    ISSUE_RE,
+    DEFAULT_PROJECT_KEY,
+    compile_issue_patterns,
+    match_project_rule,
+)
 
 logger = logging.getLogger(__name__)
 
+# OOXML names used to read slide text straight from the .pptx zip
+_NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+_NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_DOCUMENT_REL = _NS_R + "/officeDocument"
+
+_P_SLD_ID = f"{{{_NS_P}}}sldId"
+_P_SLD_ID_LST = f"{{{_NS_P}}}sldIdLst"
+_P_SP = f"{{{_NS_P}}}sp"
+_P_TX_BODY = f"{{{_NS_P}}}txBody"
+_P_SHAPE_TREE = f"{{{_NS_P}}}cSld/{{{_NS_P}}}spTree"
+_P_PLACEHOLDER = f"{{{_NS_P}}}nvSpPr/{{{_NS_P}}}nvPr/{{{_NS_P}}}ph"
+_TITLE_PLACEHOLDER_TYPES = frozenset(("title", "ctrTitle"))
+_A_P = f"{{{_NS_A}}}p"
+_R_ID = f"{{{_NS_R}}}id"
+_REL = f"{{{_NS_PKG_RELS}}}Relationship"
+
+# One native walk per text body: each a:p (paragraph start), then its run and field
+# text and a:br elements, in document order
+_TEXT_BODY_XPATH = etree.XPath(
+    "a:p | a:p/a:r/a:t/text() | a:p/a:fld/a:t/text() | a:p/a:br",
+    namespaces={"a": _NS_A},
+)
+
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+
+# Completed scans keyed on (path, mtime, size, issue regex); least recently used dropped first
+_SCAN_CACHE_SIZE = 4
+_scan_cache: "OrderedDict[tuple, Tuple[IssueSlideReference, ...]]" = OrderedDict()
+
 
 @dataclass(frozen=True)
 class IssueSlideReference:
@@ -25,47 +66,110 @@ class SlideDetector:
     
     def __init__(self, patterns: List[str] = None):
         self.patterns = patterns or ISSUE_PATTERNS
+        # The default patterns share the fused regex compiled in config; custom
+        # patterns are fused the same way once here
+        if self.patterns is ISSUE_PATTERNS:
+            self._issue_re = ISSUE_RE
+        else:
+            self._issue_re = compile_issue_patterns(self.patterns)
     
     def find_issue_slides(self, pptx_path: str) -> Generator[IssueSlideReference, None, None]:
-        """Yield issue slides with PPTX numbering and exported PDF page numbering."""
+        """Yield issue slides with PPTX numbering and exported PDF page numbering.
+        
+        Slide XML is read straight from the .pptx zip rather than through
+        python-pptx's Presentation, which would load every part of the package
+        (layouts, masters, media) and build proxies that detection never uses.
+        
+        A fully consumed scan is memoized on the file's path, mtime and size, so
+        re-scanning an unchanged presentation does not parse it again.
+        """
+        stat = os.stat(pptx_path)
+        key = (os.path.abspath(pptx_path), stat.st_mtime_ns, stat.st_size, self._issue_re.pattern)
+        cached = _scan_cache.get(key)
+        if cached is not None:
+            _scan_cache.move_to_end(key)
+            logger.info(f"Reusing issue slide scan of unchanged {pptx_path}")
+            yield from cached
+            return
+        
+        found = []
+        for reference in self._scan_issue_slides(pptx_path):
+            found.append(reference)
+            yield reference
+        
+        _scan_cache[key] = tuple(found)
+        if len(_scan_cache) > _SCAN_CACHE_SIZE:
+            _scan_cache.popitem(last=False)
+    
+    def _scan_issue_slides(self, pptx_path: str) -> Generator[IssueSlideReference, None, None]:
+        """Parse the presentation and yield its issue slides in order."""
         try:
-            prs = Presentation(pptx_path)
-            logger.info(f"Processing {len(prs.slides)} slides from {pptx_path}")
+            with zipfile.ZipFile(pptx_path) as package:
+                slide_parts = self._slide_part_names(package)
+                logger.info(f"Processing {len(slide_parts)} slides from {pptx_path}")
+
+                visible_slide_number = 0
 
-            visible_slide_number = 0
+                for idx, part_name in enumerate(slide_parts, start=1):
+                    slide = etree.fromstring(package.read(part_name), _XML_PARSER)
+                    is_hidden = self._is_hidden(slide)
+                    if not is_hidden:
+                        visible_slide_number += 1
 
-            for idx, slide in enumerate(prs.slides, start=1):
-                is_hidden = self._is_hidden(slide)
-                if not is_hidden:
-                    visible_slide_number += 1
+                    project_key = self._detect_issue_and_project(slide)
+                    if project_key is not None:  # Found an issue
+                        if is_hidden:
+                            logger.warning(
+                                "Skipping hidden issue slide %s because hidden slides are not exported to PDF",
+                                idx,
+                            )
+                            continue
 
-                project_key = self._detect_issue_and_project(slide)
-                if project_key is not None:  # Found an issue
-                    if is_hidden:
-                        logger.warning(
-                            "Skipping hidden issue slide %s because hidden slides are not exported to PDF",
+                        logger.info(
+                            "Found issue slide: pptx=%s pdf=%s → project: %s",
                             idx,
+                            visible_slide_number,
+                            project_key,
+                        )
+                        yield IssueSlideReference(
+                            pptx_slide_number=idx,
+                            pdf_page_number=visible_slide_number,
+                            project_key=project_key,
                         )
-                        continue
-
-                    logger.info(
-                        "Found issue slide: pptx=%s pdf=%s → project: %s",
-                        idx,
-                        visible_slide_number,
-                        project_key,
-                    )
-                    yield IssueSlideReference(
-                        pptx_slide_number=idx,
-                        pdf_page_number=visible_slide_number,
-                        project_key=project_key,
-                    )
         except Exception as e:
             logger.error(f"Error processing presentation: {e}")
             raise
 
+    def _slide_part_names(self, package: zipfile.ZipFile) -> List[str]:
+        """Return slide part names in presentation order (p:sldIdLst, not file names)."""
+        office_document = next(
+            target for rel_type, target in self._read_rels(package, "/").values()
+            if rel_type == _OFFICE_DOCUMENT_REL
+        )
+        presentation_part = _resolve_part("/", office_document)
+        presentation = etree.fromstring(package.read(presentation_part), _XML_PARSER)
+        rels = self._read_rels(package, presentation_part)
+
+        slide_ids = presentation.find(_P_SLD_ID_LST)
+        if slide_ids is None:
+            return []
+        return [
+            _resolve_part(presentation_part, rels[sld_id.get(_R_ID)][1])
+            for sld_id in slide_ids.iterchildren(_P_SLD_ID)
+        ]
+
+    def _read_rels(self, package: zipfile.ZipFile, part_name: str) -> Dict[str, Tuple[str, str]]:
+        """Map relationship id to (type, target) for a part, from its _rels/*.rels file."""
+        directory, filename = posixpath.split(part_name.lstrip("/"))
+        rels_xml = package.read(posixpath.join(directory, "_rels", f"{filename}.rels"))
+        return {
+            rel.get("Id"): (rel.get("Type"), rel.get("Target"))
+            for rel in etree.fromstring(rels_xml, _XML_PARSER).iterchildren(_REL)
+        }
+
     def _is_hidden(self, slide) -> bool:
         """Return True when a slide is marked hidden in the PPTX XML."""
-        show_attr = slide._element.get("show")
+        show_attr = slide.get("show")
         if show_attr is None:
             return False
 
@@ -73,26 +177,80 @@ class SlideDetector:
     
     def _detect_issue_and_project(self, slide) -> Optional[str]:
         """Detect issue slides and determine project key based on text patterns."""
-        slide_text = self._extract_slide_text(slide)
+        shape_texts = self._iter_shape_texts(slide)
         
-        # First check if it's an issue slide at all
-        if not any(re.search(pattern, slide_text) for pattern in self.patterns):
+        # First check if it's an issue slide at all, shape by shape, stopping at the
+        # first match; most slides are not issues and never need their text joined
+        seen_texts = []
+        for text in shape_texts:
+            seen_texts.append(text)
+            if _has_issue_match(self._issue_re, text):
+                break
+        else:
             return None  # Not an issue slide
         
-        # It's an issue slide, now determine the project
-        for pattern, project_key in ISSUE_PROJECT_RULES.items():
-            if re.search(pattern, slide_text):
-                logger.debug(f"Project rule matched: '{pattern}' → {project_key}")
-                return project_key
+        # It's an issue slide, now determine the project. Rule priority applies across
+        # the whole slide, so the remaining shapes are still read here.
+        seen_texts.extend(shape_texts)
+        rule = match_project_rule("\n".join(seen_texts))
+        if rule is not None:
+            pattern, project_key = rule
+            logger.debug(f"Project rule matched: '{pattern}' → {project_key}")
+            return project_key
         
         # Default project if no specific rules match
         logger.debug(f"No project rule matched, using default: {DEFAULT_PROJECT_KEY}")
         return DEFAULT_PROJECT_KEY
     
-    def _extract_slide_text(self, slide) -> str:
-        """Extract all text from a slide."""
-        texts = []
-        for shp in slide.shapes:
-            if hasattr(shp, "text") and shp.text.strip():
-                texts.append(shp.text.strip())
-        return "\n".join(texts) 
+    def _iter_shape_texts(self, slide) -> Iterator[str]:
+        """Yield the stripped, non-empty text of each top-level text shape on a slide.
+        
+        Matches python-pptx's shape.text: only p:sp shapes directly in the shape tree,
+        paragraphs joined by "\n", line breaks as "\v". Title placeholders come
+        first, since that is where issue keywords usually are and the issue scan
+        stops at the first hit; other shapes follow in shape tree order.
+        """
+        shape_tree = slide.find(_P_SHAPE_TREE)
+        if shape_tree is None:
+            return
+        shapes = list(shape_tree.iterchildren(_P_SP))
+        shapes.sort(key=lambda shp: not _is_title_placeholder(shp))
+        for shp in shapes:
+            tx_body = shp.find(_P_TX_BODY)
+            if tx_body is None:
+                continue
+            text = _text_body_text(tx_body).strip()
+            if text:
+                yield text
+
+
+def _is_title_placeholder(shape) -> bool:
+    """Return True for a title or centered-title placeholder p:sp."""
+    placeholder = shape.find(_P_PLACEHOLDER)
+    return placeholder is not None and placeholder.get("type") in _TITLE_PLACEHOLDER_TYPES
+
+
+# Decks repeat shape text (section dividers, footers, boilerplate) across many
+# slides; keyed on the compiled regex too, so detectors with custom patterns don't collide
+@functools.lru_cache(maxsize=512)
+def _has_issue_match(issue_re, text: str) -> bool:
+    """Return True if issue_re matches text."""
+    return issue_re.search(text) is not None
+
+
+def _text_body_text(tx_body) -> str:
+    """Return a txBody's text: a:r and a:fld text, "\v" per a:br, "\n" between paragraphs."""
+    text = "".join([
+        node if isinstance(node, str) else "\n" if node.tag == _A_P else "\v"
+        for node in _TEXT_BODY_XPATH(tx_body)
+    ])
+    # Drop the separator emitted for the first paragraph
+    return text[1:]
+
+
+def _resolve_part(source_part: str, target: str) -> str:
+    """Resolve a relationship target against its source part into a zip member name."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    base = posixpath.dirname(source_part.lstrip("/"))
+    return posixpath.normpath(posixpath.join(base, target))
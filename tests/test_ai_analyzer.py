@@ -0,0 +1,228 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+import openai
+from PIL import Image
+
+import ai_analyzer
+from ai_analyzer import AIAnalysisResponse, AsyncAIAnalyzer, OpenAIClient, _AsyncRateLimiter
+from config import AI_MAX_ATTEMPTS, MAX_AI_IMAGE_EDGE, AIProvider, ProcessingConfig
+
+
+class TransientError(Exception):
+    pass
+
+
+class FlakyAIClient:
+    provider_name = "Fake"
+    model_name = "fake-model"
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    async def analyze_image(self, image_bytes, slide_num):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TransientError("rate limited")
+        return AIAnalysisResponse(content="{}")
+
+    def is_retryable_error(self, error):
+        return isinstance(error, TransientError)
+
+
+def make_openai_client(handler):
+    """OpenAIClient whose HTTP traffic goes to handler(request) instead of the network."""
+    client = OpenAIClient(ProcessingConfig(
+        base_url="https://jira.example.com",
+        email="test@example.com",
+        api_token="token",
+        ai_provider=AIProvider.OPENAI,
+        openai_api_key="openai-key",
+    ))
+    client.client = client.client.with_options(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return client
+
+
+class SystemPromptTest(unittest.TestCase):
+    def test_prompt_is_a_shared_constant(self):
+        self.assertIs(ai_analyzer.get_system_prompt(), ai_analyzer.SYSTEM_PROMPT)
+        self.assertTrue(ai_analyzer._GEMINI_PROMPT_PREFIX.startswith(ai_analyzer.SYSTEM_PROMPT))
+
+
+class LoadImageBytesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write_image(self, size):
+        path = Path(self.tmpdir.name) / "slide.png"
+        Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(path)
+        return str(path)
+
+    def test_small_image_is_returned_unchanged(self):
+        path = self.write_image((64, 32))
+
+        self.assertEqual(ai_analyzer._load_image_bytes(path, 10 * 1024 * 1024), Path(path).read_bytes())
+
+    def test_oversized_image_is_downscaled_to_jpeg(self):
+        path = self.write_image((MAX_AI_IMAGE_EDGE + 400, 600))
+
+        data = ai_analyzer._load_image_bytes(path, 1024)
+
+        with Image.open(io.BytesIO(data)) as img:
+            self.assertEqual(img.format, "JPEG")
+            self.assertEqual(max(img.size), MAX_AI_IMAGE_EDGE)
+
+
+class ParseResponseTest(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = AsyncAIAnalyzer.__new__(AsyncAIAnalyzer)
+
+    def test_parses_fenced_json_object(self):
+        content = '```json\n{"title": "測試", "labels": ["db"]}\n```'
+
+        parsed = self.analyzer._parse_response(content, 1)
+
+        self.assertEqual(parsed, {"title": "測試", "labels": ["db"]})
+
+    def test_stops_at_end_of_first_object(self):
+        content = '{"title": "a {b}", "meta": {"x": 1}}\nNote: see {appendix}'
+
+        parsed = self.analyzer._parse_response(content, 2)
+
+        self.assertEqual(parsed, {"title": "a {b}", "meta": {"x": 1}})
+
+    def test_skips_brace_placeholder_in_prose_before_object(self):
+        parsed = self.analyzer._parse_response('Filled {placeholder} in:\n{"title": "real"}', 2)
+
+        self.assertEqual(parsed, {"title": "real"})
+
+    def test_falls_back_when_no_json_present(self):
+        parsed = self.analyzer._parse_response("no structured output", 7)
+
+        self.assertEqual(parsed["title"], "Issue from Slide 7")
+        self.assertEqual(parsed["description"], "no structured output")
+        self.assertEqual(parsed["priority"], "Medium")
+        self.assertEqual(parsed["issue_type"], "Task")
+        self.assertEqual(parsed["labels"], ["slide-7"])
+
+
+class OpenAIClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_sends_one_non_streaming_request(self):
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-test",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": '{"title": "t"}'},
+                }],
+                "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10},
+            })
+
+        response = await make_openai_client(handler).analyze_image(b"jpeg", 1)
+
+        self.assertEqual(len(requests), 1)
+        self.assertNotIn("stream", requests[0])
+        self.assertNotIn("stream_options", requests[0])
+        self.assertEqual(response.content, '{"title": "t"}')
+        self.assertEqual((response.input_tokens, response.output_tokens, response.total_tokens), (7, 3, 10))
+
+
+class OpenAIRetryTest(unittest.IsolatedAsyncioTestCase):
+    async def test_rate_limited_slide_sends_at_most_max_attempts_requests(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(429, json={"error": {"message": "slow down"}})
+
+        analyzer = AsyncAIAnalyzer.__new__(AsyncAIAnalyzer)
+        analyzer.ai_client = make_openai_client(handler)
+        analyzer._rate_limiter = _AsyncRateLimiter(0)
+
+        with mock.patch("ai_analyzer.asyncio.sleep", new=mock.AsyncMock()):
+            with self.assertRaises(openai.RateLimitError):
+                await analyzer._analyze_with_retry(b"image", 1)
+
+        self.assertEqual(len(requests), AI_MAX_ATTEMPTS)
+
+
+class RetryTest(unittest.IsolatedAsyncioTestCase):
+    def make_analyzer(self, client):
+        analyzer = AsyncAIAnalyzer.__new__(AsyncAIAnalyzer)
+        analyzer.ai_client = client
+        analyzer._rate_limiter = _AsyncRateLimiter(0)
+        return analyzer
+
+    async def test_retries_transient_errors_until_success(self):
+        client = FlakyAIClient(failures=AI_MAX_ATTEMPTS - 1)
+        analyzer = self.make_analyzer(client)
+
+        with mock.patch("ai_analyzer.asyncio.sleep", new=mock.AsyncMock()) as sleep:
+            response = await analyzer._analyze_with_retry(b"image", 1)
+
+        self.assertEqual(response.content, "{}")
+        self.assertEqual(client.calls, AI_MAX_ATTEMPTS)
+        self.assertEqual(sleep.await_count, AI_MAX_ATTEMPTS - 1)
+
+    async def test_gives_up_after_max_attempts(self):
+        client = FlakyAIClient(failures=AI_MAX_ATTEMPTS)
+        analyzer = self.make_analyzer(client)
+
+        with mock.patch("ai_analyzer.asyncio.sleep", new=mock.AsyncMock()):
+            with self.assertRaises(TransientError):
+                await analyzer._analyze_with_retry(b"image", 1)
+
+        self.assertEqual(client.calls, AI_MAX_ATTEMPTS)
+
+    async def test_does_not_retry_other_errors(self):
+        client = FlakyAIClient(failures=1)
+        client.is_retryable_error = lambda error: False
+        analyzer = self.make_analyzer(client)
+
+        with self.assertRaises(TransientError):
+            await analyzer._analyze_with_retry(b"image", 1)
+
+        self.assertEqual(client.calls, 1)
+
+
+class RateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_spaces_out_back_to_back_requests(self):
+        limiter = _AsyncRateLimiter(rps=10)
+
+        with mock.patch("ai_analyzer.asyncio.sleep", new=mock.AsyncMock()) as sleep:
+            await limiter.acquire()
+            await limiter.acquire()
+
+        self.assertEqual(sleep.await_count, 1)
+        self.assertGreater(sleep.await_args.args[0], 0)
+        self.assertLessEqual(sleep.await_args.args[0], 0.1)
+
+    async def test_zero_rate_disables_limiting(self):
+        limiter = _AsyncRateLimiter(rps=0)
+
+        with mock.patch("ai_analyzer.asyncio.sleep", new=mock.AsyncMock()) as sleep:
+            for _ in range(5):
+                await limiter.acquire()
+
+        sleep.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
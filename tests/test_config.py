@@ -0,0 +1,150 @@
+import dataclasses
+import io
+import os
+import re
+import tempfile
+import types
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import config
+from config import (
+    AIProvider,
+    ProcessingConfig,
+    _scope_inline_flags,
+    compile_issue_patterns,
+    compile_pattern,
+    compile_project_rules,
+    match_project_rule,
+)
+
+BASE_ENV = {
+    "JIRA_BASE_URL": "https://jira.example.com",
+    "JIRA_EMAIL": "test@example.com",
+    "JIRA_API_TOKEN": "token",
+    "GEMINI_API_KEY": "gemini-key",
+    "AI_PROVIDER": "gemini",
+}
+
+
+class ProcessingConfigTest(unittest.TestCase):
+    def setUp(self):
+        ProcessingConfig._build_from_env.cache_clear()
+        self.addCleanup(ProcessingConfig._build_from_env.cache_clear)
+        self.dotenv_path = ""
+        for target, kwargs in (
+            ("config.load_dotenv", {}),
+            ("config.find_dotenv", {"side_effect": lambda: self.dotenv_path}),
+        ):
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def load(self, **overrides):
+        env = dict(BASE_ENV, **overrides)
+        with mock.patch.dict(os.environ, env, clear=True), redirect_stdout(io.StringIO()):
+            return ProcessingConfig.from_env()
+
+    def test_config_is_frozen(self):
+        config = self.load()
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.dry_run = True
+        self.assertTrue(dataclasses.replace(config, dry_run=True).dry_run)
+
+    def test_current_model_follows_provider_through_replace(self):
+        config = self.load(OPENAI_API_KEY="openai-key", OPENAI_MODEL="gpt-test")
+
+        self.assertEqual(config.current_model, config.gemini_model)
+        openai_config = dataclasses.replace(config, ai_provider=AIProvider.OPENAI)
+        self.assertEqual(openai_config.current_model, "gpt-test")
+
+    def test_from_env_is_memoized(self):
+        env = dict(BASE_ENV)
+        with mock.patch.dict(os.environ, env, clear=True), redirect_stdout(io.StringIO()):
+            first = ProcessingConfig.from_env()
+            second = ProcessingConfig.from_env()
+
+        self.assertIs(first, second)
+        self.assertEqual(first.ai_provider, AIProvider.GEMINI)
+
+    def test_cache_is_invalidated_when_dotenv_changes(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".env", delete=False) as f:
+            self.dotenv_path = f.name
+        self.addCleanup(os.unlink, self.dotenv_path)
+        os.utime(self.dotenv_path, (1000, 1000))
+
+        first = self.load()
+        self.assertIs(self.load(), first)
+
+        os.utime(self.dotenv_path, (2000, 2000))
+        self.assertIsNot(self.load(), first)
+
+    def test_invalid_numeric_env_var_names_the_variable(self):
+        with self.assertRaisesRegex(ValueError, "MAX_CONCURRENT_REQUESTS"):
+            self.load(MAX_CONCURRENT_REQUESTS="many")
+
+
+class ProjectRuleTest(unittest.TestCase):
+    def test_returns_project_for_matching_rule(self):
+        self.assertEqual(match_project_rule("Notes\nCOJ issue: judge"), (r"(?:^|\n)coj issue:", "COJ"))
+        self.assertEqual(match_project_rule("Bug: crash"), (r"(?:^|\n)(bug):", "AP"))
+
+    def test_rule_order_wins_over_text_position(self):
+        self.assertEqual(match_project_rule("Issue: generic\nDB issue: specific"), (r"(?:^|\n)db issue:", "DB"))
+
+    def test_returns_none_without_rule_match(self):
+        self.assertIsNone(match_project_rule("Mentions an issue: inline"))
+
+    def test_rule_with_leading_inline_flag_compiles(self):
+        rules = compile_project_rules([r"(?:^|\n)db issue:", r"(?i)(?:^|\n)todo:"])
+
+        match = rules.search("Notes\nTODO: follow up")
+
+        self.assertEqual(match.lastgroup, "r1")
+
+
+class CompilePatternTest(unittest.TestCase):
+    def fake_re2(self):
+        """Stand-in for google-re2 that, like RE2, rejects backreferences."""
+        def compile(pattern):
+            if "\\1" in pattern:
+                raise fake.error("backreferences are not supported")
+            return ("re2", pattern)
+
+        fake = types.SimpleNamespace(error=type("error", (Exception,), {}), compile=compile)
+        return fake
+
+    def test_uses_re2_with_inline_case_flag(self):
+        with mock.patch.object(config, "re2", self.fake_re2()):
+            self.assertEqual(
+                compile_pattern(r"(?:^|\n)issue:", re.IGNORECASE), ("re2", r"(?i)(?:^|\n)issue:")
+            )
+            self.assertEqual(compile_pattern(r"(?:^|\n)issue:"), ("re2", r"(?:^|\n)issue:"))
+
+    def test_custom_issue_patterns_stay_case_sensitive(self):
+        fused = compile_issue_patterns([r"(?:^|\n)todo:"])
+
+        self.assertTrue(fused.search("todo: follow up"))
+        self.assertFalse(fused.search("TODO: follow up"))
+
+    def test_leading_inline_flags_are_scoped_to_their_pattern(self):
+        self.assertEqual(_scope_inline_flags(r"(?i)(?s)todo:.x"), r"(?is:todo:.x)")
+        self.assertEqual(_scope_inline_flags(r"(?i:todo):"), r"(?i:todo):")
+
+        fused = compile_issue_patterns([r"(?s)a.b", r"c.d"])
+
+        self.assertTrue(fused.search("a\nb"))
+        self.assertFalse(fused.search("c\nd"))
+
+    def test_falls_back_to_re_for_unsupported_patterns(self):
+        with mock.patch.object(config, "re2", self.fake_re2()):
+            compiled = compile_pattern(r"(\w)\1 issue:", re.IGNORECASE)
+
+        self.assertIsInstance(compiled, re.Pattern)
+        self.assertTrue(compiled.search("AA ISSUE:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
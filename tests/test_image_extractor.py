@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import fitz
+from PIL import Image
+
+from config import DEFAULT_JPEG_QUALITY, MIN_JPEG_QUALITY, ProcessingConfig
+from image_extractor import ImageExtractor
+
+
+def make_config(max_image_size_mb=2.0):
+    return ProcessingConfig(
+        base_url="https://jira.example.com",
+        email="test@example.com",
+        api_token="token",
+        max_image_size_mb=max_image_size_mb,
+    )
+
+
+def noise_image(width=400, height=300):
+    return Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+
+
+class OptimizeImageQualityTest(unittest.TestCase):
+    def test_uses_default_quality_when_it_fits(self):
+        extractor = ImageExtractor(make_config(max_image_size_mb=10))
+
+        quality, data = extractor._optimize_image_quality(noise_image())
+
+        self.assertEqual(quality, DEFAULT_JPEG_QUALITY)
+        self.assertEqual(data[:2], b"\xff\xd8")
+
+    def test_picks_highest_quality_under_limit(self):
+        image = noise_image()
+        probe = ImageExtractor(make_config())
+        limit = len(probe._encode_jpeg(image, 70, optimize=False)) + 1
+        extractor = ImageExtractor(make_config(max_image_size_mb=limit / (1024 * 1024)))
+
+        quality, data = extractor._optimize_image_quality(image)
+
+        self.assertEqual(quality, 70)
+        self.assertLessEqual(len(data), limit)
+
+    def test_falls_back_to_minimum_quality(self):
+        extractor = ImageExtractor(make_config(max_image_size_mb=0.0001))
+
+        quality, _ = extractor._optimize_image_quality(noise_image())
+
+        self.assertEqual(quality, MIN_JPEG_QUALITY)
+
+
+class ExtractSlideImagesTest(unittest.TestCase):
+    def test_extracts_mapped_pages(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = str(Path(tmpdir) / "deck.pdf")
+            doc = fitz.open()
+            for number in range(1, 4):
+                page = doc.new_page(width=720, height=405)
+                page.insert_text((72, 72), f"Page {number}")
+            doc.save(pdf_path)
+            doc.close()
+
+            extractor = ImageExtractor(make_config())
+            images = extractor.extract_slide_images(pdf_path, {2: 1, 5: 3, 9: 7}, tmpdir)
+
+            self.assertEqual(sorted(images), [2, 5])
+            self.assertTrue(images[5].endswith("slide_5.jpg"))
+            with Image.open(images[2]) as img:
+                self.assertEqual(img.format, "JPEG")
+
+    def test_rendering_waits_for_busy_encoders(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = str(Path(tmpdir) / "deck.pdf")
+            doc = fitz.open()
+            for _ in range(6):
+                doc.new_page(width=72, height=72)
+            doc.save(pdf_path)
+            doc.close()
+
+            extractor = ImageExtractor(make_config())
+            lock = threading.Lock()
+            state = {"held": 0, "max_held": 0}
+            render_page = extractor._render_page
+            save_slide_image = extractor._save_slide_image
+
+            def counting_render(*args):
+                image = render_page(*args)
+                with lock:
+                    state["held"] += 1
+                    state["max_held"] = max(state["max_held"], state["held"])
+                return image
+
+            def slow_save(*args):
+                time.sleep(0.02)
+                result = save_slide_image(*args)
+                with lock:
+                    state["held"] -= 1
+                return result
+
+            extractor._render_page = counting_render
+            extractor._save_slide_image = slow_save
+            with mock.patch("image_extractor.os.cpu_count", return_value=2):
+                images = extractor.extract_slide_images(pdf_path, {n: n for n in range(1, 7)}, tmpdir)
+
+            self.assertEqual(sorted(images), list(range(1, 7)))
+            self.assertLessEqual(state["max_held"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from aiohttp import web
+
+from ai_analyzer import SlideAnalysis
+from config import ProcessingConfig
+from jira_client import AsyncJiraClient
+
+
+def make_client(base_url="https://jira.example.com", max_concurrent_requests=5):
+    return AsyncJiraClient(ProcessingConfig(
+        base_url=base_url,
+        email="test@example.com",
+        api_token="token",
+        max_concurrent_requests=max_concurrent_requests,
+    ))
+
+
+class FakeJiraServer:
+    """Minimal local stand-in for the Jira REST endpoints used by the client."""
+
+    def __init__(self, failing_slides=()):
+        self.requests = []
+        self.attachments = []
+        self.failing_slides = set(failing_slides)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/rest/api/3/issue", self.create_issue)
+        app.router.add_post("/rest/api/3/issue/{key}/attachments", self.attach)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
+
+    async def create_issue(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        body = await request.read()
+        self.requests.append((request.headers.get("Content-Type"), body))
+        labels = json.loads(body)["fields"]["labels"]
+        if any(f"slide-{slide}" in labels for slide in self.failing_slides):
+            return web.json_response({"errors": {}}, status=400)
+        return web.json_response({"key": f"AP-{len(self.requests)}"})
+
+    async def attach(self, request):
+        post = await request.post()
+        self.attachments.append((request.match_info["key"], post["file"].filename))
+        return web.json_response([])
+
+
+class CreateADFContentTest(unittest.TestCase):
+    def test_blank_text_gives_empty_document(self):
+        self.assertEqual(
+            make_client()._create_adf_content("  \n\n "),
+            {"type": "doc", "version": 1, "content": []},
+        )
+
+    def test_headings_bold_and_plain_paragraphs(self):
+        text = "# 標題\n\n## Steps \n\n**Important**\n\n  plain text\nsecond line  \n\n\n\n"
+
+        doc = make_client()._create_adf_content(text)
+
+        self.assertEqual(doc["type"], "doc")
+        self.assertEqual(doc["content"], [
+            {"type": "heading", "attrs": {"level": 1},
+             "content": [{"type": "text", "text": "標題"}]},
+            {"type": "heading", "attrs": {"level": 2},
+             "content": [{"type": "text", "text": "Steps"}]},
+            {"type": "paragraph",
+             "content": [{"type": "text", "text": "Important", "marks": [{"type": "strong"}]}]},
+            {"type": "paragraph",
+             "content": [{"type": "text", "text": "plain text\nsecond line"}]},
+        ])
+
+    def test_heading_markers_need_a_space_and_bold_spans_lines(self):
+        doc = make_client()._create_adf_content("#tag\n\n**multi\nline**\n\n**left** open")
+
+        self.assertEqual(doc["content"], [
+            {"type": "paragraph", "content": [{"type": "text", "text": "#tag"}]},
+            {"type": "paragraph",
+             "content": [{"type": "text", "text": "multi\nline", "marks": [{"type": "strong"}]}]},
+            {"type": "paragraph", "content": [{"type": "text", "text": "**left** open"}]},
+        ])
+
+
+class CreateIssueTest(unittest.IsolatedAsyncioTestCase):
+    async def test_posts_json_payload_and_returns_issue_key(self):
+        analysis = SlideAnalysis(slide_number=4, title="登入失敗", description="**Steps**", project_key="AP")
+
+        async with FakeJiraServer() as server:
+            client = make_client(server.base_url)
+            async with client:
+                results = await client.create_issues_and_attach([analysis], {})
+
+        self.assertEqual(results[0].jira_key, "AP-1")
+        content_type, body = server.requests[0]
+        self.assertEqual(content_type, "application/json")
+        fields = json.loads(body)["fields"]
+        self.assertEqual(fields["summary"], "登入失敗")
+        self.assertEqual(fields["labels"], ["slide-4"])
+        self.assertEqual(fields["description"]["content"][0]["content"][0]["marks"], [{"type": "strong"}])
+
+    async def test_create_issues_and_attach_uploads_each_created_issue(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            slide_images = {}
+            for slide in (1, 2, 3):
+                path = Path(workdir) / f"slide_{slide}.jpg"
+                path.write_bytes(b"jpeg")
+                slide_images[slide] = str(path)
+            analyses = [
+                SlideAnalysis(slide_number=slide, title=f"t{slide}", description="d", project_key="AP")
+                for slide in (1, 2, 3)
+            ]
+
+            async with FakeJiraServer(failing_slides=[2]) as server:
+                client = make_client(server.base_url)
+                async with client:
+                    with self.assertLogs("jira_client", level="ERROR"):
+                        results = await client.create_issues_and_attach(analyses, slide_images)
+
+        self.assertEqual([result.slide_number for result in results], [1, 2, 3])
+        self.assertIsNone(results[1].jira_key)
+        self.assertEqual(
+            sorted(filename for _, filename in server.attachments),
+            ["slide_1.jpg", "slide_3.jpg"],
+        )
+        self.assertEqual(
+            {key for key, _ in server.attachments},
+            {results[0].jira_key, results[2].jira_key},
+        )
+
+    async def test_cancellation_reports_issues_already_created(self):
+        first = SlideAnalysis(slide_number=1, title="t", description="d", project_key="AP")
+        forever = asyncio.Event()
+
+        async def analyses():
+            yield first
+            await forever.wait()
+
+        async with FakeJiraServer() as server:
+            client = make_client(server.base_url)
+            async with client:
+                task = asyncio.ensure_future(client.create_issues_and_attach(analyses(), {}))
+                while first.jira_key is None:
+                    await asyncio.sleep(0.01)
+                with self.assertLogs("jira_client", level="WARNING") as logs:
+                    task.cancel()
+                    with self.assertRaises(asyncio.CancelledError):
+                        await task
+
+        self.assertIn("AP-1", "\n".join(logs.output))
+
+    async def test_connection_pool_caps_concurrent_requests(self):
+        analyses = [
+            SlideAnalysis(slide_number=slide, title="t", description="d", project_key="AP")
+            for slide in range(8)
+        ]
+
+        async with FakeJiraServer() as server:
+            client = make_client(server.base_url, max_concurrent_requests=2)
+            async with client:
+                results = await client.create_issues_and_attach(analyses, {})
+
+        self.assertTrue(all(result.jira_key for result in results))
+        self.assertEqual(server.max_in_flight, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
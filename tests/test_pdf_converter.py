@@ -0,0 +1,69 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from config import ProcessingConfig
+from pdf_converter import PDFConverter
+
+
+def make_config(**overrides):
+    return ProcessingConfig(
+        base_url="https://jira.example.com",
+        email="test@example.com",
+        api_token="token",
+        **overrides,
+    )
+
+
+class ConvertToPdfTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.workdir = Path(tmp.name)
+        self.pptx_path = self.workdir / "deck.pptx"
+        self.pptx_path.write_bytes(b"pptx")
+        self.pdf_path = self.workdir / "deck.pdf"
+
+    def fake_run(self, fail_commands=()):
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(cmd[0])
+            if cmd[0] in fail_commands:
+                raise FileNotFoundError(cmd[0])
+            self.pdf_path.write_bytes(b"%PDF")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        return calls, run
+
+    def test_uses_soffice_without_unoserver(self):
+        calls, run = self.fake_run()
+        with mock.patch("pdf_converter.subprocess.run", side_effect=run):
+            result = PDFConverter(make_config()).convert_to_pdf(str(self.pptx_path), str(self.workdir))
+
+        self.assertEqual(calls, ["soffice"])
+        self.assertEqual(Path(result), self.pdf_path.resolve())
+
+    def test_uses_running_unoserver_when_port_configured(self):
+        calls, run = self.fake_run()
+        with mock.patch("pdf_converter.subprocess.run", side_effect=run) as run_mock:
+            PDFConverter(make_config(unoserver_port=2003)).convert_to_pdf(str(self.pptx_path), str(self.workdir))
+
+        self.assertEqual(calls, ["unoconvert"])
+        cmd = run_mock.call_args[0][0]
+        self.assertIn("2003", cmd)
+        self.assertEqual(cmd[-1], str(self.pdf_path.resolve()))
+
+    def test_falls_back_to_soffice_when_unoconvert_missing(self):
+        calls, run = self.fake_run(fail_commands=("unoconvert",))
+        with mock.patch("pdf_converter.subprocess.run", side_effect=run):
+            with self.assertLogs("pdf_converter", level="WARNING"):
+                PDFConverter(make_config(unoserver_port=2003)).convert_to_pdf(str(self.pptx_path), str(self.workdir))
+
+        self.assertEqual(calls, ["unoconvert", "soffice"])
+
+
+if __name__ == "__main__":
+    unittest.main()
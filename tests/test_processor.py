@@ -0,0 +1,242 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from ai_analyzer import AIAnalysisResponse, AsyncAIAnalyzer, _AsyncRateLimiter
+from config import ProcessingConfig
+from processor import AsyncPowerPointToJiraProcessor, temp_workdir
+from slide_detector import IssueSlideReference
+
+
+class FakeDetector:
+    def __init__(self, slides, wait_for=None):
+        self.slides = slides
+        self.wait_for = wait_for
+
+    def find_issue_slides(self, pptx_path):
+        for index, slide in enumerate(self.slides):
+            if index == 1 and self.wait_for is not None:
+                # Only reachable if conversion already started while scanning
+                if not self.wait_for.wait(timeout=5):
+                    raise AssertionError("PDF conversion did not overlap detection")
+            yield slide
+
+
+class FailingDetector:
+    def find_issue_slides(self, pptx_path):
+        yield IssueSlideReference(pptx_slide_number=1, pdf_page_number=1, project_key="AP")
+        raise ValueError("corrupt slide")
+
+
+class FakeConverter:
+    def __init__(self, release=None):
+        self.started = threading.Event()
+        self.finished = threading.Event()
+        self.release = release
+        self.calls = 0
+
+    def convert_to_pdf(self, pptx_path, output_dir):
+        self.calls += 1
+        self.started.set()
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        self.finished.set()
+        return f"{output_dir}/deck.pdf"
+
+
+class FakeExtractor:
+    """Reports slide 1, then waits until `overlapped` is set before slide 2."""
+
+    def __init__(self, overlapped):
+        self.overlapped = overlapped
+
+    def extract_slide_images(self, pdf_path, slide_page_mapping, output_dir, on_image=None):
+        on_image(1, "slide_1.jpg")
+        if not self.overlapped.wait(timeout=5):
+            raise AssertionError("Downstream work did not overlap extraction")
+        on_image(2, "slide_2.jpg")
+        return {1: "slide_1.jpg", 2: "slide_2.jpg"}
+
+
+class FailingExtractor:
+    """Reports slide 1, then fails once `overlapped` is set."""
+
+    def __init__(self, overlapped):
+        self.overlapped = overlapped
+
+    def extract_slide_images(self, pdf_path, slide_page_mapping, output_dir, on_image=None):
+        on_image(1, "slide_1.jpg")
+        self.overlapped.wait(timeout=5)
+        raise RuntimeError("render failed")
+
+
+class SignallingAIClient:
+    provider_name = "Fake"
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.started = threading.Event()
+
+    async def analyze_image(self, image_bytes, slide_num):
+        self.started.set()
+        return AIAnalysisResponse(content='{"title": "slide %d"}' % slide_num)
+
+
+class FakeJiraClient:
+    def __init__(self):
+        self.issue_created = threading.Event()
+        self.attached = []
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.closed = True
+
+    async def create_issues_and_attach(self, analyses, slide_images):
+        received = []
+        async for analysis in analyses:
+            analysis.jira_key = f"KEY-{analysis.slide_number}"
+            self.attached.append(slide_images[analysis.slide_number])
+            self.issue_created.set()
+            received.append(analysis)
+        return received
+
+
+async def fake_read_image_bytes(image_path):
+    return b"image-bytes"
+
+
+def make_processor(detector=None, converter=None, extractor=None, ai_client=None,
+                   jira_client=None):
+    processor = AsyncPowerPointToJiraProcessor.__new__(AsyncPowerPointToJiraProcessor)
+    processor.config = ProcessingConfig(
+        base_url="https://jira.example.com",
+        email="test@example.com",
+        api_token="token",
+        dry_run=jira_client is None,
+    )
+    processor.slide_detector = detector
+    processor.pdf_converter = converter
+    processor.image_extractor = extractor
+    processor.jira_client = jira_client
+    if ai_client is not None:
+        analyzer = AsyncAIAnalyzer.__new__(AsyncAIAnalyzer)
+        analyzer.config = processor.config
+        analyzer.ai_client = ai_client
+        analyzer.manual_project_key = None
+        analyzer._rate_limiter = _AsyncRateLimiter(0)
+        analyzer._read_image_bytes_async = fake_read_image_bytes
+        processor.ai_analyzer = analyzer
+    return processor
+
+
+class TempWorkdirTest(unittest.TestCase):
+    def test_cleanup_frees_workdir_name_immediately(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pptx_path = str(Path(tmpdir) / "deck.pptx")
+            with temp_workdir(pptx_path) as workdir:
+                Path(workdir, "slide_1.jpg").write_bytes(b"jpeg")
+
+            self.assertFalse(os.path.exists(workdir))
+            for thread in threading.enumerate():
+                if thread.name == "workdir-cleanup":
+                    thread.join(timeout=5)
+            self.assertEqual(os.listdir(tmpdir), [])
+
+    def test_debug_keeps_workdir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pptx_path = str(Path(tmpdir) / "deck.pptx")
+            with temp_workdir(pptx_path, debug=True) as workdir:
+                Path(workdir, "slide_1.jpg").write_bytes(b"jpeg")
+
+            self.assertTrue(os.path.exists(Path(workdir, "slide_1.jpg")))
+
+
+class DetectAndConvertTest(unittest.IsolatedAsyncioTestCase):
+    async def test_conversion_starts_with_first_issue_slide(self):
+        converter = FakeConverter()
+        slides = [
+            IssueSlideReference(pptx_slide_number=1, pdf_page_number=1, project_key="AP"),
+            IssueSlideReference(pptx_slide_number=3, pdf_page_number=2, project_key="DB"),
+        ]
+        processor = make_processor(FakeDetector(slides, wait_for=converter.started), converter)
+
+        issue_slides, pdf_path = await processor._detect_and_convert("deck.pptx", "work")
+
+        self.assertEqual(issue_slides, slides)
+        self.assertEqual(pdf_path, "work/deck.pdf")
+        self.assertEqual(converter.calls, 1)
+
+    async def test_skips_conversion_without_issue_slides(self):
+        converter = FakeConverter()
+        processor = make_processor(FakeDetector([]), converter)
+
+        issue_slides, pdf_path = await processor._detect_and_convert("deck.pptx", "work")
+
+        self.assertEqual((issue_slides, pdf_path), ([], None))
+        self.assertEqual(converter.calls, 0)
+
+    async def test_detection_error_waits_for_conversion_without_blocking_loop(self):
+        converter = FakeConverter(release=threading.Event())
+        processor = make_processor(FailingDetector(), converter)
+
+        task = asyncio.ensure_future(processor._detect_and_convert("deck.pptx", "work"))
+        # Only reachable while the conversion is still running if the loop isn't blocked
+        await asyncio.sleep(0.1)
+        self.assertTrue(converter.started.is_set())
+        self.assertFalse(task.done())
+        converter.release.set()
+
+        with self.assertRaises(ValueError):
+            await task
+        self.assertTrue(converter.finished.is_set())
+
+
+class SlidePipelineTest(unittest.IsolatedAsyncioTestCase):
+    async def test_analysis_starts_while_extraction_runs(self):
+        ai_client = SignallingAIClient()
+        processor = make_processor(extractor=FakeExtractor(ai_client.started), ai_client=ai_client)
+
+        analyses = await processor._run_slide_pipeline(
+            "deck.pdf", {1: 1, 2: 2}, {1: "AP", 2: "DB"}, "work"
+        )
+
+        self.assertEqual([a.slide_number for a in analyses], [1, 2])
+        self.assertEqual([a.project_key for a in analyses], ["AP", "DB"])
+
+    async def test_issue_created_while_extraction_runs(self):
+        jira_client = FakeJiraClient()
+        processor = make_processor(
+            extractor=FakeExtractor(jira_client.issue_created),
+            ai_client=SignallingAIClient(),
+            jira_client=jira_client,
+        )
+
+        analyses = await processor._run_slide_pipeline(
+            "deck.pdf", {1: 1, 2: 2}, {1: "AP", 2: "DB"}, "work"
+        )
+
+        self.assertEqual([a.jira_key for a in analyses], ["KEY-1", "KEY-2"])
+        self.assertEqual(jira_client.attached, ["slide_1.jpg", "slide_2.jpg"])
+
+    async def test_extraction_error_waits_for_jira_session_to_close(self):
+        jira_client = FakeJiraClient()
+        processor = make_processor(
+            extractor=FailingExtractor(jira_client.issue_created),
+            ai_client=SignallingAIClient(),
+            jira_client=jira_client,
+        )
+
+        with self.assertRaises(RuntimeError):
+            await processor._run_slide_pipeline("deck.pdf", {1: 1, 2: 2}, {1: "AP", 2: "DB"}, "work")
+
+        self.assertTrue(jira_client.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
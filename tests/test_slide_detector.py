@@ -0,0 +1,203 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+from slide_detector import IssueSlideReference, SlideDetector, _has_issue_match
+
+
+def build_deck(path, slides):
+    """Write a deck where each slide is a list of textbox strings; '!hidden' hides it."""
+    prs = Presentation()
+    layout = prs.slide_layouts[6]  # Blank
+    for texts in slides:
+        slide = prs.slides.add_slide(layout)
+        for text in texts:
+            if text == "!hidden":
+                slide._element.set("show", "0")
+                continue
+            box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+            box.text_frame.text = text
+    prs.save(path)
+
+
+class SlideDetectorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def find(self, slides, detector=None):
+        path = str(Path(self.tmpdir.name) / "deck.pptx")
+        build_deck(path, slides)
+        return list((detector or SlideDetector()).find_issue_slides(path))
+
+    def test_detects_issue_slides_and_projects(self):
+        results = self.find([
+            ["Agenda"],
+            ["Summary", "DB issue: low ANI"],
+            ["bug: crash on start"],
+            ["Coj issue: judging error"],
+            ["AJ ISSUE: timeout"],
+            ["New feature: export"],
+            ["Mentions an issue: inline only"],
+        ])
+
+        self.assertEqual(results, [
+            IssueSlideReference(pptx_slide_number=2, pdf_page_number=2, project_key="DB"),
+            IssueSlideReference(pptx_slide_number=3, pdf_page_number=3, project_key="AP"),
+            IssueSlideReference(pptx_slide_number=4, pdf_page_number=4, project_key="COJ"),
+            IssueSlideReference(pptx_slide_number=5, pdf_page_number=5, project_key="AJ"),
+            IssueSlideReference(pptx_slide_number=6, pdf_page_number=6, project_key="AP"),
+        ])
+
+    def test_project_rule_priority_spans_later_shapes(self):
+        results = self.find([["Issue: generic", "Notes", "DB issue: specific"]])
+
+        self.assertEqual(results[0].project_key, "DB")
+
+    def test_debug_log_names_the_winning_rule(self):
+        with self.assertLogs("slide_detector", level="DEBUG") as logs:
+            self.find([["Issue: generic", "DB issue: specific"]])
+
+        self.assertIn(r"Project rule matched: '(?:^|\n)db issue:' → DB", "\n".join(logs.output))
+
+    def test_skips_hidden_slides_and_keeps_pdf_numbering(self):
+        results = self.find([
+            ["Issue: first"],
+            ["!hidden", "Issue: hidden"],
+            ["Issue: third"],
+        ])
+
+        self.assertEqual(
+            [(r.pptx_slide_number, r.pdf_page_number) for r in results],
+            [(1, 1), (3, 2)],
+        )
+
+    def test_follows_presentation_order_rather_than_part_names(self):
+        path = str(Path(self.tmpdir.name) / "deck.pptx")
+        build_deck(path, [["Agenda"], ["Bug: moved to front"]])
+        prs = Presentation(path)
+        slide_ids = prs.slides._sldIdLst
+        moved = slide_ids[-1]
+        slide_ids.remove(moved)
+        slide_ids.insert(0, moved)
+        prs.save(path)
+
+        results = list(SlideDetector().find_issue_slides(path))
+
+        self.assertEqual([r.pptx_slide_number for r in results], [1])
+
+    def test_matches_python_pptx_shape_text(self):
+        path = str(Path(self.tmpdir.name) / "deck.pptx")
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[1])  # Title and Content
+        slide.shapes.title.text = "Weekly sync"
+        body = slide.placeholders[1].text_frame
+        body.text = "Notes\vcontinued"
+        body.add_paragraph().text = "DB issue: index missing"
+        group = slide.shapes.add_group_shape()
+        group.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1)).text_frame.text = "AJ issue: grouped"
+        prs.save(path)
+
+        detector = SlideDetector()
+        with zipfile.ZipFile(path) as package:
+            part_name = detector._slide_part_names(package)[0]
+            texts = list(detector._iter_shape_texts(etree.fromstring(package.read(part_name))))
+
+        expected = [shape.text.strip() for shape in Presentation(path).slides[0].shapes
+                    if hasattr(shape, "text") and shape.text.strip()]
+        self.assertEqual(texts, expected)
+        self.assertEqual(texts[1], "Notes\vcontinued\nDB issue: index missing")
+
+    def test_title_placeholder_text_comes_first(self):
+        path = str(Path(self.tmpdir.name) / "deck.pptx")
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[5])  # Title Only
+        slide.shapes.add_textbox(Inches(1), Inches(2), Inches(4), Inches(1)).text_frame.text = "Long notes"
+        slide.shapes.title.text = "Bug: title crash"
+        # Move the title after the textbox in the shape tree
+        title = slide.shapes.title._element
+        title.getparent().append(title)
+        prs.save(path)
+
+        detector = SlideDetector()
+        with zipfile.ZipFile(path) as package:
+            part_name = detector._slide_part_names(package)[0]
+            texts = list(detector._iter_shape_texts(etree.fromstring(package.read(part_name))))
+
+        self.assertEqual(texts, ["Bug: title crash", "Long notes"])
+        self.assertEqual(list(detector.find_issue_slides(path))[0].project_key, "AP")
+
+    def test_repeated_shape_text_is_matched_once(self):
+        detector = SlideDetector(patterns=[r"(?:^|\n)repeat-check:"])
+        _has_issue_match.cache_clear()
+
+        results = self.find([["Section divider"]] * 3 + [["repeat-check: x"]], detector)
+
+        self.assertEqual([r.pptx_slide_number for r in results], [4])
+        info = _has_issue_match.cache_info()
+        self.assertEqual((info.misses, info.hits), (2, 2))
+
+    def test_custom_pattern_with_leading_inline_flag(self):
+        detector = SlideDetector(patterns=[r"(?i)(?:^|\n)todo:", r"(?:^|\n)fixme:"])
+
+        results = self.find([["TODO: follow up"], ["FIXME: shouty"], ["fixme: later"]], detector)
+
+        self.assertEqual([r.pptx_slide_number for r in results], [1, 3])
+
+    def test_custom_patterns_are_case_sensitive(self):
+        detector = SlideDetector(patterns=[r"(?:^|\n)todo:"])
+
+        results = self.find([["TODO: shouty"], ["todo: quiet"]], detector)
+
+        self.assertEqual([r.pptx_slide_number for r in results], [2])
+
+    def test_custom_patterns_fall_back_to_default_project(self):
+        detector = SlideDetector(patterns=[r"(?:^|\n)todo:"])
+
+        results = self.find([["Issue: not matched"], ["todo: follow up"]], detector)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].pptx_slide_number, 2)
+        self.assertEqual(results[0].project_key, "AP")
+
+    def test_rescan_of_unchanged_file_reuses_result(self):
+        path = str(Path(self.tmpdir.name) / "deck.pptx")
+        build_deck(path, [["Issue: first"], ["Agenda"], ["Bug: second"]])
+        detector = SlideDetector()
+        first = list(detector.find_issue_slides(path))
+
+        with mock.patch("slide_detector.zipfile.ZipFile") as zip_file:
+            second = list(SlideDetector().find_issue_slides(path))
+
+        zip_file.assert_not_called()
+        self.assertEqual(second, first)
+
+    def test_modified_file_is_rescanned(self):
+        path = str(Path(self.tmpdir.name) / "deck.pptx")
+        build_deck(path, [["Issue: first"]])
+        self.assertEqual(len(list(SlideDetector().find_issue_slides(path))), 1)
+
+        build_deck(path, [["Issue: first"], ["DB issue: second"]])
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        results = list(SlideDetector().find_issue_slides(path))
+
+        self.assertEqual([r.project_key for r in results], ["AP", "DB"])
+
+    def test_partially_consumed_scan_is_not_cached(self):
+        path = str(Path(self.tmpdir.name) / "deck.pptx")
+        build_deck(path, [["Issue: first"], ["Bug: second"]])
+        next(SlideDetector().find_issue_slides(path))
+
+        self.assertEqual(len(list(SlideDetector().find_issue_slides(path))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 import io
+import sys
 import unittest
 from contextlib import redirect_stdout
 
-from ai_analyzer import AIAnalysisResponse, AsyncAIAnalyzer, SlideAnalysis
+from ai_analyzer import AIAnalysisResponse, AsyncAIAnalyzer, SlideAnalysis, _AsyncRateLimiter
 from config import AIProvider, ProcessingConfig
 from config import DEFAULT_OPENAI_MODEL
 from main import print_results
@@ -12,7 +13,7 @@ class FakeAIClient:
     provider_name = "Fake"
     model_name = "fake-model"
 
-    async def analyze_image(self, base64_image, slide_num):
+    async def analyze_image(self, image_bytes, slide_num):
         return AIAnalysisResponse(
             content='{"title": "測試", "description": "描述", "priority": "Medium", "issue_type": "Task", "labels": []}',
             input_tokens=10,
@@ -21,14 +22,21 @@ class FakeAIClient:
         )
 
 
-async def fake_encode_image_base64(image_path):
-    return "encoded-image"
+async def fake_read_image_bytes(image_path):
+    return b"image-bytes"
 
 
 class TokenUsageOutputTest(unittest.TestCase):
     def test_default_openai_model_is_gpt_55(self):
         self.assertEqual(DEFAULT_OPENAI_MODEL, "gpt-5.5")
 
+    def test_slide_analysis_uses_slots_when_supported(self):
+        analysis = SlideAnalysis(slide_number=1, title="t", description="d")
+
+        if sys.version_info >= (3, 10):
+            self.assertFalse(hasattr(analysis, "__dict__"))
+        self.assertEqual(analysis.labels, [])
+
     def test_print_results_includes_image_and_jira_token_totals(self):
         results = [
             SlideAnalysis(
@@ -74,7 +82,8 @@ class AnalyzerTokenUsageTest(unittest.IsolatedAsyncioTestCase):
         analyzer.config = config
         analyzer.ai_client = FakeAIClient()
         analyzer.manual_project_key = None
-        analyzer._encode_image_base64_async = fake_encode_image_base64
+        analyzer._rate_limiter = _AsyncRateLimiter(0)
+        analyzer._read_image_bytes_async = fake_read_image_bytes
 
         result = await analyzer.analyze_slide("slide.png", 3, "AP")
 